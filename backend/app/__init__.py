@@ -21,6 +21,10 @@ def create_app(config_name='development'):
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
     app.config.from_object(config[config_name])
 
+    # JSON provider cepat (orjson) untuk jsonify / request.get_json
+    from .utils.json_provider import init_json_provider
+    init_json_provider(app)
+
     # Pastikan folder upload ada
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
@@ -36,6 +40,13 @@ def create_app(config_name='development'):
     # Initialize extensions
     migrate.init_app(app, db)
     jwt.init_app(app)
+
+    # Cek token yang dicabut (in-memory, tanpa query per request)
+    from .utils.revocation import revocation_list
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return revocation_list.is_revoked(jwt_payload)
     
     # Register blueprints
     from .routes import admin_bp, employee_bp, auth_bp, attendance_bp
@@ -48,5 +59,9 @@ def create_app(config_name='development'):
     # from .models import *
     
     db.init_app(app)
+
+    # Register CLI commands
+    from .commands import register_commands
+    register_commands(app)
     
     return app
@@ -0,0 +1,593 @@
+import csv
+import json
+import resource
+import statistics
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, time as dtime, timedelta
+
+import click
+from flask import current_app
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, insert
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .models import (
+    db, Attendance, AttendanceMonthlySummary, DailySchedule, Employee, EmployeeSchedule,
+    RevokedToken, WorkSchedule
+)
+from .utils.attendance_export import EXPORT_FORMATS, encode_chunks, iter_attendance_chunks
+from .utils.attendance_summary import rebuild_summaries
+from .utils.date_helper import HARI, day_range
+from .utils.employee_import import import_employees
+from .utils.employee_purge import purge_deleted_employees
+from .utils.password import PasswordVerifierBusy, password_hash_method, password_verifier
+from .utils.qr_code import current_qr_code
+from .utils.serializers import attendance_row, serialize_rows
+from .utils.sse import attendance_changes
+
+
+def _percentiles(timings_ms):
+    """(p50, p99) dari daftar latensi dalam ms."""
+    if len(timings_ms) < 2:
+        value = timings_ms[0] if timings_ms else 0.0
+        return value, value
+    percentiles = statistics.quantiles(timings_ms, n=100)
+    return percentiles[49], percentiles[98]
+
+
+@contextmanager
+def _bench_employees(count):
+    """
+    Karyawan sintetis (email @bench.invalid) yang dijadwalkan sepanjang hari ini,
+    di-commit supaya terlihat oleh request test_client. Semua baris bench
+    (absensi, summary, jadwal, karyawan, shift) dihapus lagi di akhir.
+    Yield list id karyawan.
+    """
+    now = datetime.now()
+    shift = WorkSchedule(name=f"BENCH-{now:%Y%m%d%H%M%S%f}", start_time=dtime(0, 0), end_time=dtime(23, 59), tolerance_minutes=0)
+    day = DailySchedule.query.filter(DailySchedule.name == HARI[now.weekday()]).first()
+    created_day = day is None
+    if created_day:
+        day = DailySchedule(name=HARI[now.weekday()])
+    db.session.add_all([shift, day])
+    db.session.flush()
+
+    db.session.execute(insert(Employee), [{
+        "nik": f"BENCH-{i}",
+        "name": f"Bench {i}",
+        "gender": "Other",
+        "position": "Bench",
+        "email": f"bench-{i}@bench.invalid",
+        "password": "!"
+    } for i in range(count)])
+    employee_ids = [row.id for row in db.session.query(Employee.id).filter(Employee.email.like("%@bench.invalid"))]
+    db.session.execute(insert(EmployeeSchedule), [
+        {"employee_id": employee_id, "work_schedules_id": shift.id, "daily_schedules_id": day.id}
+        for employee_id in employee_ids
+    ])
+    db.session.commit()
+
+    try:
+        yield employee_ids
+    finally:
+        db.session.rollback()
+        for model in (Attendance, AttendanceMonthlySummary, EmployeeSchedule):
+            model.query.filter(model.employee_id.in_(employee_ids)).delete(synchronize_session=False)
+        Employee.query.filter(Employee.id.in_(employee_ids)).delete(synchronize_session=False)
+        WorkSchedule.query.filter(WorkSchedule.id == shift.id).delete(synchronize_session=False)
+        if created_day:
+            DailySchedule.query.filter(DailySchedule.id == day.id).delete(synchronize_session=False)
+        db.session.commit()
+
+
+@contextmanager
+def _count_queries(thread_prefix=None):
+    """
+    Hitung statement SQL yang dijalankan engine selama blok berjalan; semua
+    thread, atau hanya thread yang namanya diawali thread_prefix.
+    """
+    counter = {"queries": 0}
+    lock = threading.Lock()
+
+    def count(*args):
+        if thread_prefix and not threading.current_thread().name.startswith(thread_prefix):
+            return
+        with lock:
+            counter["queries"] += 1
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+
+
+def register_commands(app):
+    """
+    Daftarkan command CLI aplikasi (dipanggil dari create_app).
+    """
+
+    @app.cli.command("export-attendance")
+    @click.argument("output", type=click.Path(dir_okay=False, writable=True))
+    @click.option("--format", "export_format", type=click.Choice(list(EXPORT_FORMATS)), default="csv",
+                  help="parquet membutuhkan pyarrow")
+    @click.option("--date-from", type=click.DateTime(formats=["%Y-%m-%d"]), default=None)
+    @click.option("--date-to", type=click.DateTime(formats=["%Y-%m-%d"]), default=None)
+    @click.option("--employee-id", type=int, default=None)
+    @click.option("--position", default=None)
+    @click.option("--chunk-size", type=int, default=None, help="Baris per chunk (default EXPORT_CHUNK_SIZE)")
+    def export_attendance(output, export_format, date_from, date_to, employee_id, position, chunk_size):
+        """Export data absensi ke CSV / CSV gzip / Parquet secara streaming."""
+        filters = {
+            "date_from": date_from.date() if date_from else None,
+            "date_to": date_to.date() if date_to else None,
+            "employee_id": employee_id,
+            "position": position
+        }
+        chunk_size = chunk_size or current_app.config["EXPORT_CHUNK_SIZE"]
+
+        rows = 0
+
+        def counted(chunks):
+            nonlocal rows
+            for chunk in chunks:
+                rows += len(chunk)
+                yield chunk
+
+        started = time.perf_counter()
+        size = 0
+        with open(output, "wb") as f:
+            for part in encode_chunks(export_format, counted(iter_attendance_chunks(filters, chunk_size))):
+                f.write(part)
+                size += len(part)
+        elapsed = time.perf_counter() - started
+
+        # ru_maxrss dalam KB di Linux
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        click.echo(f"{rows} rows -> {output} ({size} bytes) in {elapsed:.2f}s")
+        click.echo(f"{rows / elapsed if elapsed else 0:.0f} rows/sec, peak RSS {peak_rss_mb:.1f} MB")
+
+    @app.cli.command("rebuild-summaries")
+    @click.option("--from", "month_from", type=click.DateTime(formats=["%Y-%m"]), required=True)
+    @click.option("--to", "month_to", type=click.DateTime(formats=["%Y-%m"]), default=None, help="Default sama dengan --from")
+    @click.option("--employee-id", "employee_ids", type=int, multiple=True)
+    def rebuild_summaries_command(month_from, month_to, employee_ids):
+        """Hitung ulang tabel attendance_monthly_summary untuk rentang bulan."""
+        month_to = month_to or month_from
+        if month_to < month_from:
+            raise click.BadParameter("--to must not be earlier than --from")
+
+        started = time.perf_counter()
+        written = rebuild_summaries(
+            month_from.date(),
+            month_to.date(),
+            employee_ids=list(employee_ids) or None,
+            chunk_size=current_app.config["EXPORT_CHUNK_SIZE"]
+        )
+        db.session.commit()
+        click.echo(
+            f"{written} summary rows rebuilt for {month_from:%Y-%m}..{month_to:%Y-%m} "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    @app.cli.command("bench-hash")
+    @click.option("--target-ms", type=float, default=250.0, help="Target latensi satu hash password (ms)")
+    @click.option("--samples", type=int, default=5)
+    def bench_hash(target_ms, samples):
+        """Ukur latensi hash password dan sarankan PASSWORD_HASH_ITERATIONS."""
+        method = current_app.config["PASSWORD_HASH_METHOD"]
+        iterations = current_app.config["PASSWORD_HASH_ITERATIONS"]
+        if not method.startswith("pbkdf2"):
+            raise click.UsageError("bench-hash only supports pbkdf2 methods")
+
+        def measure(iteration_count):
+            timings = []
+            for _ in range(samples):
+                started = time.perf_counter()
+                generate_password_hash("benchmark-password", method=f"{method}:{iteration_count}")
+                timings.append((time.perf_counter() - started) * 1000)
+            return statistics.median(timings)
+
+        current_ms = measure(iterations)
+        click.echo(f"current policy {method}:{iterations}: {current_ms:.1f} ms/hash (median of {samples})")
+
+        # Biaya PBKDF2 linear terhadap jumlah iterasi; bulatkan ke 10.000 terdekat
+        suggested = max(int(target_ms / (current_ms / iterations) // 10000 * 10000), 10000)
+        suggested_ms = measure(suggested)
+        click.echo(f"suggested {method}:{suggested}: {suggested_ms:.1f} ms/hash (target {target_ms:.0f} ms)")
+        click.echo(f"PASSWORD_HASH_ITERATIONS={suggested}")
+
+    @app.cli.command("bench-login-burst")
+    @click.option("--logins", type=int, default=300, help="Jumlah login bersamaan")
+    @click.option("--probe-interval-ms", type=float, default=10.0, help="Jeda antar probe scan (ms)")
+    @click.option("--probe-employees", type=int, default=200, help="Karyawan bench yang dipakai probe scan")
+    @click.option("--unbounded", is_flag=True, help="Verifikasi langsung di thread request (perilaku lama)")
+    def bench_login_burst(logins, probe_interval_ms, probe_employees, unbounded):
+        """
+        Latensi POST /api/attendance/scan (p50/p99) selama badai login bersamaan.
+        Probe memakai karyawan sintetis yang dihapus di akhir.
+        """
+        app_obj = current_app._get_current_object()
+        pwhash = generate_password_hash("benchmark-password", method=password_hash_method())
+        counts = {"ok": 0, "rejected": 0}
+        counts_lock = threading.Lock()
+        burst_done = threading.Event()
+        start = threading.Barrier(logins + 1)
+
+        def login():
+            with app_obj.app_context():
+                start.wait()
+                try:
+                    if unbounded:
+                        check_password_hash(pwhash, "benchmark-password")
+                    else:
+                        password_verifier.verify(pwhash, "benchmark-password")
+                    outcome = "ok"
+                except PasswordVerifierBusy:
+                    outcome = "rejected"
+                with counts_lock:
+                    counts[outcome] += 1
+
+        # Probe: request scan lengkap lewat test client, diulang selama burst
+        # berlangsung. Setiap probe memakai site QR berbeda supaya lolos replay
+        # cache; putaran kedua per karyawan berakhir 409 (sudah absen hari ini).
+        probe_ms = []
+        probe_statuses = {}
+
+        with _bench_employees(probe_employees) as employee_ids:
+            tokens = {employee_id: create_access_token(identity={"id": employee_id, "role": "employee"}) for employee_id in employee_ids}
+
+            def probe():
+                client = app_obj.test_client()
+                run_id = f"{time.time_ns():x}"
+                attempt = 0
+                while not burst_done.is_set():
+                    employee_id = employee_ids[attempt % len(employee_ids)]
+                    with app_obj.app_context():
+                        qr_data = current_qr_code(f"probe-{run_id}-{attempt}")["qr_data"]
+                    attempt += 1
+                    started = time.perf_counter()
+                    response = client.post(
+                        "/api/attendance/scan",
+                        json={"qr_data": qr_data, "employee_id": employee_id},
+                        headers={"Authorization": f"Bearer {tokens[employee_id]}"}
+                    )
+                    probe_ms.append((time.perf_counter() - started) * 1000)
+                    probe_statuses[response.status_code] = probe_statuses.get(response.status_code, 0) + 1
+                    time.sleep(probe_interval_ms / 1000)
+
+            threads = [threading.Thread(target=login) for _ in range(logins)]
+            for t in threads:
+                t.start()
+            probe_thread = threading.Thread(target=probe)
+            probe_thread.start()
+            started = time.perf_counter()
+            start.wait()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+            burst_done.set()
+            probe_thread.join()
+
+        p50, p99 = _percentiles(probe_ms)
+        mode = "unbounded" if unbounded else f"bounded ({app_obj.config['PASSWORD_VERIFY_WORKERS']} workers, queue {app_obj.config['PASSWORD_VERIFY_QUEUE']})"
+        click.echo(f"{logins} logins, {mode}: {counts['ok']} verified, {counts['rejected']} rejected (503) in {elapsed:.2f}s")
+        click.echo(
+            f"POST /api/attendance/scan: {len(probe_ms)} requests ("
+            + ", ".join(f"{code}: {count}" for code, count in sorted(probe_statuses.items()))
+            + f"), p50 {p50:.2f} ms, p99 {p99:.2f} ms"
+        )
+
+    @app.cli.command("bench-scan")
+    @click.option("--rows", "row_counts", type=int, multiple=True,
+                  help="Jumlah baris attendance, boleh diulang (default 10000, 100000, 1000000; mis. --rows 10000000)")
+    @click.option("--employees", "employee_count", type=int, default=1000)
+    @click.option("--samples", type=int, default=200)
+    def bench_scan(row_counts, employee_count, samples):
+        """
+        Latensi (p50/p99) query rentang hari "sudah absen hari ini" saat tabel
+        attendance membesar. Data sintetis ditulis dalam satu transaksi yang
+        di-rollback di akhir.
+        """
+        row_counts = sorted(row_counts or (10000, 100000, 1000000))
+        today = datetime.now().date()
+        day_start, day_end = day_range(today)
+        chunk_size = 10000
+
+        try:
+            db.session.execute(insert(Employee), [{
+                "nik": f"BENCH-{i}",
+                "name": f"Bench {i}",
+                "gender": "Other",
+                "position": "Bench",
+                "email": f"bench-{i}@bench.invalid",
+                "password": "!"
+            } for i in range(employee_count)])
+            employee_ids = [
+                row.id for row in db.session.query(Employee.id).filter(Employee.email.like("%@bench.invalid"))
+            ]
+
+            # Separuh karyawan sudah absen hari ini
+            db.session.execute(insert(Attendance), [
+                {"employee_id": employee_id, "date": day_start + timedelta(hours=7), "status": "tepat_waktu"}
+                for employee_id in employee_ids[::2]
+            ])
+
+            # Baris ke-n: karyawan n % E, mundur n // E + 1 hari dari hari ini
+            inserted = 0
+            for target in row_counts:
+                started = time.perf_counter()
+                while inserted < target:
+                    end = min(inserted + chunk_size, target)
+                    db.session.execute(insert(Attendance), [{
+                        "employee_id": employee_ids[n % len(employee_ids)],
+                        "date": day_start - timedelta(days=n // len(employee_ids) + 1) + timedelta(hours=7, minutes=n % 60),
+                        "status": "tepat_waktu"
+                    } for n in range(inserted, end)])
+                    inserted = end
+                seeded = time.perf_counter() - started
+
+                timings = []
+                for sample in range(samples):
+                    employee_id = employee_ids[sample % len(employee_ids)]
+                    started = time.perf_counter()
+                    db.session.query(Attendance.id).filter(
+                        Attendance.employee_id == employee_id,
+                        Attendance.date >= day_start,
+                        Attendance.date < day_end
+                    ).first()
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                p50, p99 = _percentiles(timings)
+                click.echo(
+                    f"{target} rows (seeded in {seeded:.1f}s): today lookup p50 {p50:.2f} ms, "
+                    f"p99 {p99:.2f} ms ({samples} samples)"
+                )
+        finally:
+            db.session.rollback()
+
+    @app.cli.command("bench-concurrent-scan")
+    @click.option("--employees", "employee_count", type=int, default=50)
+    @click.option("--scans-per-employee", type=int, default=4, help="Scan bersamaan per karyawan")
+    def bench_concurrent_scan(employee_count, scans_per_employee):
+        """
+        Load test POST /api/attendance/scan: setiap karyawan bench mengirim
+        beberapa scan bersamaan (QR site berbeda, jadi lolos replay cache).
+        Harus tercatat tepat satu absensi per karyawan; dilaporkan juga jumlah
+        query per request. Memakai karyawan sintetis yang dihapus di akhir.
+        """
+        app_obj = current_app._get_current_object()
+        with _bench_employees(employee_count) as employee_ids:
+            tokens = {employee_id: create_access_token(identity={"id": employee_id, "role": "employee"}) for employee_id in employee_ids}
+            qr_codes = [current_qr_code(f"bench{attempt}")["qr_data"] for attempt in range(scans_per_employee)]
+            jobs = [(employee_id, qr_data) for employee_id in employee_ids for qr_data in qr_codes]
+            statuses = {}
+            statuses_lock = threading.Lock()
+            start = threading.Barrier(len(jobs) + 1)
+
+            def scan(employee_id, qr_data):
+                client = app_obj.test_client()
+                start.wait()
+                response = client.post(
+                    "/api/attendance/scan",
+                    json={"qr_data": qr_data, "employee_id": employee_id},
+                    headers={"Authorization": f"Bearer {tokens[employee_id]}"}
+                )
+                with statuses_lock:
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            threads = [threading.Thread(target=scan, args=job) for job in jobs]
+            for t in threads:
+                t.start()
+            with _count_queries() as counter:
+                started = time.perf_counter()
+                start.wait()
+                for t in threads:
+                    t.join()
+                elapsed = time.perf_counter() - started
+
+            per_employee = dict(
+                db.session.query(Attendance.employee_id, db.func.count())
+                .filter(Attendance.employee_id.in_(employee_ids))
+                .group_by(Attendance.employee_id)
+            )
+            duplicates = sum(count - 1 for count in per_employee.values() if count > 1)
+            missing = sum(1 for employee_id in employee_ids if employee_id not in per_employee)
+
+        click.echo(
+            f"{len(jobs)} scans ({employee_count} employees x {scans_per_employee}) in {elapsed:.2f}s: "
+            + ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items()))
+        )
+        click.echo(f"attendance rows: {sum(per_employee.values())}, duplicates {duplicates}, missing {missing}")
+        click.echo(f"queries: {counter['queries']} total, {counter['queries'] / len(jobs):.1f} per scan request")
+
+    @app.cli.command("bench-sse")
+    @click.option("--streams", type=int, default=50, help="Jumlah stream SSE yang dibuka bersamaan")
+    @click.option("--scans", type=int, default=20, help="Jumlah scan selama stream terbuka")
+    def bench_sse(streams, scans):
+        """
+        Buka banyak stream GET /api/attendance/today/stream, kirim sejumlah scan,
+        lalu hitung query database yang dijalankan oleh thread stream. Query
+        stream seharusnya tetap datar, tidak bertambah per stream x scan.
+        """
+        app_obj = current_app._get_current_object()
+        with _bench_employees(scans) as employee_ids:
+            tokens = {employee_id: create_access_token(identity={"id": employee_id, "role": "employee"}) for employee_id in employee_ids}
+            qr_data = current_qr_code("bench-sse")["qr_data"]
+            ready = threading.Barrier(streams + 1)
+            stop = threading.Event()
+            delivered = [0] * streams
+
+            def read_stream(index):
+                response = app_obj.test_client().get("/api/attendance/today/stream", buffered=False)
+                try:
+                    for i, chunk in enumerate(response.response):
+                        if i == 0:
+                            ready.wait()
+                        delivered[index] += (chunk if isinstance(chunk, str) else chunk.decode()).count("event: scan")
+                        if stop.is_set():
+                            break
+                finally:
+                    response.close()
+
+            with _count_queries(thread_prefix="bench-sse") as counter:
+                threads = [
+                    threading.Thread(target=read_stream, args=(i,), name=f"bench-sse-{i}", daemon=True)
+                    for i in range(streams)
+                ]
+                for t in threads:
+                    t.start()
+                ready.wait()
+                snapshot_queries = counter["queries"]
+
+                client = app_obj.test_client()
+                started = time.perf_counter()
+                for employee_id in employee_ids:
+                    client.post(
+                        "/api/attendance/scan",
+                        json={"qr_data": qr_data, "employee_id": employee_id},
+                        headers={"Authorization": f"Bearer {tokens[employee_id]}"}
+                    )
+                deadline = time.monotonic() + 10
+                while sum(delivered) < streams * scans and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                elapsed = time.perf_counter() - started
+
+                # Bangunkan stream supaya berhenti
+                stop.set()
+                attendance_changes.notify()
+                for t in threads:
+                    t.join(timeout=5)
+                stream_queries = counter["queries"] - snapshot_queries
+
+        click.echo(f"{streams} streams, {scans} scans: {sum(delivered)}/{streams * scans} scan events delivered in {elapsed:.2f}s")
+        click.echo(f"stream queries: {snapshot_queries} while opening, {stream_queries} during scans ({stream_queries / scans:.2f} per scan)")
+
+    @app.cli.command("bench-conditional")
+    @click.option("--path", default="/api/admin/work-schedulesOP", help="Endpoint GET yang memakai @conditional")
+    @click.option("--employees", "employee_count", type=int, default=500, help="Karyawan bench yang dijadwalkan")
+    @click.option("--samples", type=int, default=200)
+    def bench_conditional(path, employee_count, samples):
+        """
+        Bandingkan response penuh dengan revalidasi 304 (If-None-Match) pada
+        endpoint @conditional: latensi p50/p99 dan jumlah query per request.
+        """
+        client = current_app.test_client()
+        with _bench_employees(employee_count):
+            first = client.get(path)
+            if first.status_code != 200 or not first.headers.get("ETag"):
+                raise click.ClickException(f"GET {path} returned {first.status_code} without an ETag")
+            etag = first.headers["ETag"]
+
+            def measure(headers, expected_status):
+                timings = []
+                with _count_queries() as counter:
+                    for _ in range(samples):
+                        started = time.perf_counter()
+                        response = client.get(path, headers=headers)
+                        timings.append((time.perf_counter() - started) * 1000)
+                        if response.status_code != expected_status:
+                            raise click.ClickException(f"GET {path} returned {response.status_code}, expected {expected_status}")
+                return _percentiles(timings), counter["queries"] / samples, len(response.data)
+
+            (full_p50, full_p99), full_queries, full_bytes = measure({}, 200)
+            (cond_p50, cond_p99), cond_queries, cond_bytes = measure({"If-None-Match": etag}, 304)
+
+        click.echo(f"GET {path}, {samples} samples each")
+        click.echo(f"200 full: p50 {full_p50:.2f} ms, p99 {full_p99:.2f} ms, {full_queries:.1f} queries/request, {full_bytes} bytes")
+        click.echo(f"304 revalidate: p50 {cond_p50:.2f} ms, p99 {cond_p99:.2f} ms, {cond_queries:.1f} queries/request, {cond_bytes} bytes")
+
+    @app.cli.command("bench-serialize")
+    @click.option("--rows", "row_count", type=int, default=10000)
+    @click.option("--samples", type=int, default=5)
+    def bench_serialize(row_count, samples):
+        """Bandingkan serialisasi listing absensi: dict + strftime + json vs serializer + app.json."""
+        Row = namedtuple("Row", ["attendance_id", "employee_id", "employee_name", "position", "attendance_date"])
+        base = datetime(2026, 1, 1, 7, 30)
+        rows = [
+            Row(i, i % 500, f"Employee {i % 500}", "Staff", base + timedelta(minutes=i))
+            for i in range(row_count)
+        ]
+
+        def legacy():
+            result = [{
+                "attendance_id": r.attendance_id,
+                "employee_id": r.employee_id,
+                "employee_name": r.employee_name,
+                "position": r.position,
+                "attendance_date": r.attendance_date.strftime("%Y-%m-%d %H:%M:%S")
+            } for r in rows]
+            return json.dumps({"count": len(result), "attendances": result})
+
+        def current():
+            result = serialize_rows(attendance_row, rows)
+            return current_app.json.dumps({"count": len(result), "attendances": result})
+
+        if json.loads(legacy()) != json.loads(current()):
+            raise click.ClickException("serializer output differs from legacy output")
+
+        def measure(fn):
+            timings = []
+            for _ in range(samples):
+                started = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - started) * 1000)
+            return statistics.median(timings)
+
+        legacy_ms = measure(legacy)
+        current_ms = measure(current)
+        click.echo(f"{row_count} rows, median of {samples} ({type(current_app.json).__name__})")
+        click.echo(f"legacy  (dict + strftime + json): {legacy_ms:.1f} ms")
+        click.echo(f"current (serializer + app.json):  {current_ms:.1f} ms ({legacy_ms / current_ms:.1f}x)")
+
+    @app.cli.command("purge-revoked-tokens")
+    def purge_revoked_tokens():
+        """Hapus baris revoked_tokens yang tokennya sudah kadaluarsa."""
+        deleted = RevokedToken.query.filter(RevokedToken.expires_at <= datetime.now()).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+        click.echo(f"{deleted} expired revoked tokens purged")
+
+    @app.cli.command("purge-deleted-employees")
+    @click.option("--older-than-days", type=int, default=None, help="Default EMPLOYEE_PURGE_AFTER_DAYS")
+    @click.option("--batch-size", type=int, default=None, help="Karyawan per batch (default EMPLOYEE_PURGE_BATCH_SIZE)")
+    @click.option("--pause", type=float, default=0, help="Jeda antar batch (detik)")
+    def purge_deleted_employees_command(older_than_days, batch_size, pause):
+        """Hapus permanen karyawan soft-delete beserta absensi, jadwal dan summary-nya."""
+        started = time.perf_counter()
+        purged = purge_deleted_employees(older_than_days, batch_size, pause)
+        click.echo(f"{purged} deleted employees purged in {time.perf_counter() - started:.2f}s")
+
+    @app.cli.command("qr-code")
+    @click.option("--site", default="main")
+    def qr_code(site):
+        """Tampilkan QR code absensi yang berlaku saat ini untuk sebuah lokasi."""
+        try:
+            code = current_qr_code(site)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        click.echo(code["qr_data"])
+        click.echo(f"valid for {code['expires_in']:.0f}s (rotation {code['rotation_seconds']}s)")
+
+    @app.cli.command("import-employees")
+    @click.argument("source", type=click.File("r", encoding="utf-8-sig"))
+    @click.option("--chunk-size", type=int, default=None, help="Baris per INSERT (default EMPLOYEE_IMPORT_CHUNK_SIZE)")
+    def import_employees_command(source, chunk_size):
+        """Import karyawan dari CSV (kolom: nik,name,gender,position,email,password)."""
+        rows = list(csv.DictReader(source))
+        started = time.perf_counter()
+        results = import_employees(rows, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - started
+
+        # Baris CSV dihitung mulai 2 (baris 1 adalah header)
+        for result in results:
+            if result["status"] != "created":
+                detail = f" ({result['error']})" if result.get("error") else ""
+                click.echo(f"line {result['index'] + 2}: {result['status']}{detail} nik={result['nik']} email={result['email']}")
+
+        created = sum(1 for r in results if r["status"] == "created")
+        click.echo(f"{created} of {len(rows)} employees created in {elapsed:.2f}s")
@@ -1,10 +1,26 @@
-from flask import jsonify, request
-from sqlalchemy.exc import SQLAlchemyError
+from flask import jsonify, request, Response, stream_with_context, current_app
+from sqlalchemy import case, insert, select
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from datetime import timedelta
-from ..models import db, Employee, DailySchedule, WorkSchedule, EmployeeSchedule, Attendance, Admin
+from ..models import db, Employee, DailySchedule, WorkSchedule, EmployeeSchedule, Attendance, AttendanceMonthlySummary, Admin
+from ..utils.attendance_export import EXPORT_FORMATS, stream_export
+from ..utils.attendance_query import filtered_attendance_query, parse_attendance_filters
+from ..utils.conditional import conditional, last_updated, row_count, employee_schedules_validator
+from ..utils.dashboard import dashboard_cache
+from ..utils.pagination import parse_limit, encode_cursor, decode_cursor
+from ..utils.db_errors import is_duplicate_key, duplicate_key_name
+from ..utils.employee_import import import_employees
+from ..utils.identity_cache import identity_cache
+from ..utils.password import password_verifier, PasswordVerifierBusy, busy_response, hash_password, rehash_password
+from ..utils.presence import presence
+from ..utils.qr_code import current_qr_code, replay_cache
+from ..utils.reference_cache import reference_cache
+from ..utils.revocation import revocation_list
+from ..utils.roster_cache import roster_cache
+from ..utils.serializers import serialize_rows, employee_row, employee_schedule_row, attendance_row, monthly_summary_row, work_schedule_op_row
+from ..utils.sse import attendance_changes
 
 
 
@@ -30,20 +46,33 @@ def admin_login():
         if not admin:
             return jsonify({"message": "Email atau password salah"}), 401
 
-        # Verifikasi password
-        if not check_password_hash(admin.password, password):
+        # Verifikasi password (executor terbatas)
+        try:
+            password_valid = password_verifier.verify(admin.password, password)
+        except PasswordVerifierBusy:
+            return busy_response()
+
+        if not password_valid:
             return jsonify({"message": "Email atau password salah"}), 401
 
-        # Generate JWT token dengan masa berlaku 7 hari
+        # Hash ulang ke kebijakan hash terbaru jika perlu
+        rehash_password(admin, password)
+
+        # Generate JWT access token (berumur pendek) + refresh token
         access_token = create_access_token(
             identity={"id": admin.id, "role": "admin"},
-            expires_delta=timedelta(days=7)
+            expires_delta=current_app.config["ACCESS_TOKEN_EXPIRES"]
+        )
+        refresh_token = create_refresh_token(
+            identity={"id": admin.id, "role": "admin"},
+            expires_delta=current_app.config["REFRESH_TOKEN_EXPIRES"]
         )
 
         # Return data admin + token
         return jsonify({
             "message": "Login berhasil",
             "access_token": access_token,
+            "refresh_token": refresh_token,
             "id": admin.id,
             "name": admin.name,
             "email": admin.email
@@ -57,35 +86,80 @@ def admin_login():
         return jsonify({"message": "Internal server error", "error": str(e)}), 500
 
 def get_all_employees():
+    """
+    Daftar karyawan dengan pencarian + keyset pagination (urut created_at, id terbaru dulu)
+    GET /admin/employees?q=&position=&gender=&limit=&cursor=
+    q: prefix nama, NIK, atau email
+    """
     try:
-        # Query utama: ambil semua data karyawan
-        employees = (
-            db.session.query(
-                Employee.id.label("id"),
-                Employee.nik.label("nik"),
-                Employee.name.label("name"),
-                Employee.gender.label("gender"),
-                Employee.position.label("position"),
-                Employee.email.label("email")
+        # Parse parameter pagination dan filter
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            cursor = request.args.get("cursor")
+            cursor_created_at, cursor_id = decode_cursor(cursor) if cursor else (None, None)
+        except ValueError:
+            return jsonify({"message": "Invalid pagination parameter"}), 400
+
+        q = (request.args.get("q") or "").strip()
+        position = request.args.get("position")
+        gender = request.args.get("gender")
+        if gender and gender not in Employee.gender.type.enums:
+            return jsonify({"message": "Invalid gender filter"}), 400
+
+        query = db.session.query(
+            Employee.id.label("id"),
+            Employee.nik.label("nik"),
+            Employee.name.label("name"),
+            Employee.gender.label("gender"),
+            Employee.position.label("position"),
+            Employee.email.label("email"),
+            Employee.created_at.label("created_at")
+        ).filter(Employee.not_deleted())
+
+        # Prefix match (LIKE 'q%') supaya index name / nik / email tetap terpakai
+        if q:
+            pattern = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            query = query.filter(
+                Employee.name.like(pattern, escape="\\") |
+                Employee.nik.like(pattern, escape="\\") |
+                Employee.email.like(pattern, escape="\\")
             )
-            .order_by(Employee.created_at.desc())
+        if position:
+            query = query.filter(Employee.position == position)
+        if gender:
+            query = query.filter(Employee.gender == gender)
+
+        # Lanjutkan setelah baris terakhir halaman sebelumnya
+        if cursor:
+            query = query.filter(
+                (Employee.created_at < cursor_created_at) |
+                ((Employee.created_at == cursor_created_at) & (Employee.id < cursor_id))
+            )
+
+        # Ambil satu baris lebih untuk tahu apakah masih ada halaman berikutnya
+        employees = (
+            query
+            .order_by(Employee.created_at.desc(), Employee.id.desc())
+            .limit(limit + 1)
             .all()
         )
 
-        result = []
-        for e in employees:
-            result.append({
-                "id": e.id,
-                "nik": e.nik,
-                "name": e.name,
-                "gender": e.gender,
-                "position": e.position,
-                "email": e.email
-            })
+        has_more = len(employees) > limit
+        employees = employees[:limit]
+
+        result = serialize_rows(employee_row, employees)
 
+        next_cursor = None
+        if has_more:
+            last = employees[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        # "count" = jumlah baris di halaman ini (bukan total keseluruhan)
         return jsonify({
-            "total_employees": len(result),
-            "employees": result
+            "count": len(result),
+            "employees": result,
+            "limit": limit,
+            "next_cursor": next_cursor
         }), 200
 
     except SQLAlchemyError as e:
@@ -94,6 +168,10 @@ def get_all_employees():
 
 
 
+@conditional(lambda id_employee: [
+    last_updated(Employee, Employee.id == id_employee),
+    *employee_schedules_validator(id_employee)
+])
 def get_employee_by_id(id_employee: int):
     try:
         # Ambil data karyawan utama
@@ -106,7 +184,7 @@ def get_employee_by_id(id_employee: int):
                 Employee.position.label("position"),
                 Employee.email.label("email")
             )
-            .filter(Employee.id == id_employee)
+            .filter(Employee.id == id_employee, Employee.not_deleted())
             .first()
         )
 
@@ -133,18 +211,7 @@ def get_employee_by_id(id_employee: int):
         )
 
         # Format hasil jadwal
-        schedule_list = []
-        for s in schedules:
-            schedule_list.append({
-                "employee_schedule_id": s.employee_schedule_id,
-                "day_id": s.day_id,
-                "day_name": s.day_name,
-                "schedule_id": s.schedule_id,
-                "schedule_name": s.schedule_name,
-                "start_time": s.start_time.strftime("%H:%M"),
-                "end_time": s.end_time.strftime("%H:%M"),
-                "tolerance_minutes": s.tolerance_minutes
-            })
+        schedule_list = serialize_rows(employee_schedule_row, schedules)
 
         # Gabungkan hasil karyawan dan jadwalnya
         result = {
@@ -165,64 +232,12 @@ def get_employee_by_id(id_employee: int):
 
 
 def get_available_schedules_for_employee(id_employee: int):
+    """
+    Semua work schedule + daily schedule yang bisa dipilih untuk employee,
+    disajikan dari reference cache (payload sama untuk semua employee)
+    """
     try:
-        # --- Ambil daftar daily_schedules_id yang sudah dimiliki oleh employee ---
-        # (Masih bisa disimpan kalau nanti dibutuhkan)
-        assigned_daily_schedules = (
-            db.session.query(EmployeeSchedule.daily_schedules_id)
-            .filter(EmployeeSchedule.employee_id == id_employee)
-            .subquery()
-        )
-
-        # --- Ambil semua WorkSchedule (tanpa filter) ---
-        all_work_schedules = (
-            db.session.query(
-                WorkSchedule.id,
-                WorkSchedule.name,
-                WorkSchedule.start_time,
-                WorkSchedule.end_time,
-                WorkSchedule.tolerance_minutes
-            )
-            .order_by(WorkSchedule.id.asc())
-            .all()
-        )
-
-        # --- Ambil semua DailySchedule (tanpa filter) ---
-        available_daily_schedules = (
-            db.session.query(
-                DailySchedule.id,
-                DailySchedule.name
-            )
-            .order_by(DailySchedule.id.asc())
-            .all()
-        )
-
-        # --- Format hasil ---
-        work_schedule_list = [
-            {
-                "id": ws.id,
-                "name": ws.name,
-                "start_time": ws.start_time.strftime("%H:%M"),
-                "end_time": ws.end_time.strftime("%H:%M"),
-                "tolerance_minutes": ws.tolerance_minutes,
-            }
-            for ws in all_work_schedules
-        ]
-
-        daily_schedule_list = [
-            {
-                "id": ds.id,
-                "name": ds.name,
-            }
-            for ds in available_daily_schedules
-        ]
-
-        result = {
-            "daily_schedules": daily_schedule_list,
-            "work_schedules": work_schedule_list,
-        }
-
-        return jsonify(result), 200
+        return reference_cache.response("available_schedules")
 
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -243,50 +258,40 @@ def add_employee_schedule(id_employee):  # Tambahkan parameter ini
         if not all([employee_id, work_schedules_id, daily_schedules_id]):
             return jsonify({"message": "work_schedules_id dan daily_schedules_id wajib diisi"}), 400
 
-        # --- Cek apakah employee, work schedule, dan daily schedule benar-benar ada ---
-        employee_exists = db.session.query(Employee.id).filter_by(id=employee_id).first()
-        if not employee_exists:
+        # Karyawan yang di-soft-delete masih ada di tabel, jadi tidak ditolak foreign key
+        if _missing_ids(Employee, [employee_id], Employee.not_deleted()):
             return jsonify({"message": "Employee tidak ditemukan"}), 404
 
-        work_schedule_exists = db.session.query(WorkSchedule.id).filter_by(id=work_schedules_id).first()
-        if not work_schedule_exists:
-            return jsonify({"message": "Work schedule tidak ditemukan"}), 404
-
-        daily_schedule_exists = db.session.query(DailySchedule.id).filter_by(id=daily_schedules_id).first()
-        if not daily_schedule_exists:
-            return jsonify({"message": "Daily schedule tidak ditemukan"}), 404
-
-        # --- Cek apakah kombinasi sudah ada (hindari duplikasi) ---
-        existing_schedule = (
-            db.session.query(EmployeeSchedule)
-            .filter_by(
-                employee_id=employee_id,
-                work_schedules_id=work_schedules_id,
-                daily_schedules_id=daily_schedules_id
-            )
-            .first()
-        )
-
-        if existing_schedule:
-            return jsonify({"message": "Schedule untuk kombinasi ini sudah ada"}), 400
-
-        # --- Buat entri baru ---
+        # --- Buat entri baru; duplikasi ditolak unique constraint, referensi
+        # yang tidak ada ditolak foreign key (dicek hanya saat INSERT gagal) ---
         new_schedule = EmployeeSchedule(
             employee_id=employee_id,
             work_schedules_id=work_schedules_id,
             daily_schedules_id=daily_schedules_id
         )
 
-        db.session.add(new_schedule)
-        db.session.commit()
+        try:
+            db.session.add(new_schedule)
+            db.session.flush()
+            new_id = new_schedule.id
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_duplicate_key(e):
+                return jsonify({"message": "Schedule untuk kombinasi ini sudah ada"}), 400
+            missing = _missing_schedule_reference(employee_id, work_schedules_id, daily_schedules_id)
+            if missing:
+                return jsonify({"message": missing}), 404
+            raise
+        roster_cache.invalidate_employee(employee_id)
 
         return jsonify({
             "message": "Employee schedule berhasil ditambahkan",
             "data": {
-                "id": new_schedule.id,
-                "employee_id": new_schedule.employee_id,
-                "work_schedules_id": new_schedule.work_schedules_id,
-                "daily_schedules_id": new_schedule.daily_schedules_id
+                "id": new_id,
+                "employee_id": employee_id,
+                "work_schedules_id": work_schedules_id,
+                "daily_schedules_id": daily_schedules_id
             }
         }), 201
 
@@ -295,6 +300,194 @@ def add_employee_schedule(id_employee):  # Tambahkan parameter ini
         return jsonify({"error": str(e)}), 500
 
 
+def _parse_id_list(value):
+    """List id integer unik dari body request, None jika formatnya tidak valid."""
+    if not isinstance(value, list) or not value:
+        return None
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in value):
+        return None
+    return list(dict.fromkeys(value))
+
+
+def _missing_ids(model, ids, *criteria):
+    """Id yang tidak ada di tabel model atau tidak memenuhi criteria (satu query)."""
+    found = {row.id for row in db.session.query(model.id).filter(model.id.in_(ids), *criteria)}
+    return [i for i in ids if i not in found]
+
+
+def _missing_schedule_reference(employee_id, work_schedules_id, daily_schedules_id):
+    """
+    Pesan 404 untuk referensi employee / work schedule / daily schedule yang tidak
+    ada, None jika semuanya ada. Dipanggil hanya setelah INSERT/UPDATE gagal.
+    """
+    if employee_id and _missing_ids(Employee, [employee_id], Employee.not_deleted()):
+        return "Employee tidak ditemukan"
+    if work_schedules_id and _missing_ids(WorkSchedule, [work_schedules_id]):
+        return "Work schedule tidak ditemukan"
+    if daily_schedules_id and _missing_ids(DailySchedule, [daily_schedules_id]):
+        return "Daily schedule tidak ditemukan"
+    return None
+
+
+def _insert_employee_schedules(rows):
+    """
+    Simpan kombinasi (employee_id, work_schedules_id, daily_schedules_id) dengan satu
+    INSERT multi-row, melewati kombinasi yang sudah ada (dicek dengan satu query).
+    Return jumlah baris yang disimpan; commit dilakukan pemanggil.
+    """
+    employee_ids = {r["employee_id"] for r in rows}
+    existing = {
+        (r.employee_id, r.work_schedules_id, r.daily_schedules_id)
+        for r in db.session.query(
+            EmployeeSchedule.employee_id,
+            EmployeeSchedule.work_schedules_id,
+            EmployeeSchedule.daily_schedules_id
+        ).filter(EmployeeSchedule.employee_id.in_(employee_ids))
+    }
+    new_rows = [
+        r for r in rows
+        if (r["employee_id"], r["work_schedules_id"], r["daily_schedules_id"]) not in existing
+    ]
+    if new_rows:
+        db.session.execute(insert(EmployeeSchedule), new_rows)
+    return len(new_rows)
+
+
+def bulk_assign_employee_schedules():
+    """
+    Tambahkan satu work schedule ke banyak karyawan x banyak hari sekaligus
+    POST /admin/employee-schedules/bulk
+    Body: { "employee_ids": [...], "daily_schedules_ids": [...], "work_schedules_id": ... }
+    Kombinasi yang sudah ada dilewati.
+    """
+    try:
+        data = request.get_json() or {}
+        employee_ids = _parse_id_list(data.get("employee_ids"))
+        daily_schedules_ids = _parse_id_list(data.get("daily_schedules_ids"))
+        work_schedules_id = data.get("work_schedules_id")
+
+        # --- Validasi input dasar ---
+        if not employee_ids or not daily_schedules_ids or not isinstance(work_schedules_id, int):
+            return jsonify({"message": "employee_ids, daily_schedules_ids dan work_schedules_id wajib diisi"}), 400
+
+        max_rows = current_app.config["SCHEDULE_BULK_MAX"]
+        if len(employee_ids) * len(daily_schedules_ids) > max_rows:
+            return jsonify({"message": f"Maksimal {max_rows} jadwal per request"}), 413
+
+        # --- Cek keberadaan employee, work schedule, dan daily schedule (satu query per tabel) ---
+        missing_employees = _missing_ids(Employee, employee_ids, Employee.not_deleted())
+        if missing_employees:
+            return jsonify({"message": "Employee tidak ditemukan", "employee_ids": missing_employees}), 404
+
+        if _missing_ids(WorkSchedule, [work_schedules_id]):
+            return jsonify({"message": "Work schedule tidak ditemukan"}), 404
+
+        missing_days = _missing_ids(DailySchedule, daily_schedules_ids)
+        if missing_days:
+            return jsonify({"message": "Daily schedule tidak ditemukan", "daily_schedules_ids": missing_days}), 404
+
+        rows = [
+            {
+                "employee_id": employee_id,
+                "work_schedules_id": work_schedules_id,
+                "daily_schedules_id": daily_schedules_id
+            }
+            for employee_id in employee_ids
+            for daily_schedules_id in daily_schedules_ids
+        ]
+        try:
+            created = _insert_employee_schedules(rows)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            return jsonify({"message": "Sebagian jadwal ditambahkan oleh request lain, silakan kirim ulang"}), 409
+        roster_cache.invalidate_employees(employee_ids)
+
+        return jsonify({
+            "message": f"{created} employee schedule berhasil ditambahkan",
+            "created": created,
+            "skipped": len(rows) - created
+        }), 201
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def copy_employee_schedules(id_employee):
+    """
+    Salin seluruh jadwal mingguan satu karyawan ke karyawan lain
+    POST /admin/employees/<id>/schedules/copy
+    Body: { "target_employee_ids": [...], "replace": false }
+    replace=true menghapus jadwal lama karyawan tujuan terlebih dahulu.
+    """
+    try:
+        data = request.get_json() or {}
+        target_ids = _parse_id_list(data.get("target_employee_ids"))
+        replace = bool(data.get("replace", False))
+
+        if not target_ids:
+            return jsonify({"message": "target_employee_ids wajib diisi"}), 400
+        target_ids = [i for i in target_ids if i != id_employee]
+
+        # --- Cek employee sumber + tujuan (satu query) ---
+        missing = _missing_ids(Employee, [id_employee] + target_ids, Employee.not_deleted())
+        if id_employee in missing:
+            return jsonify({"message": "Employee tidak ditemukan"}), 404
+        if missing:
+            return jsonify({"message": "Employee tujuan tidak ditemukan", "employee_ids": missing}), 404
+
+        template = (
+            db.session.query(EmployeeSchedule.work_schedules_id, EmployeeSchedule.daily_schedules_id)
+            .filter(EmployeeSchedule.employee_id == id_employee)
+            .all()
+        )
+        if not template:
+            return jsonify({"message": "Employee sumber belum memiliki jadwal"}), 400
+
+        max_rows = current_app.config["SCHEDULE_BULK_MAX"]
+        if len(template) * len(target_ids) > max_rows:
+            return jsonify({"message": f"Maksimal {max_rows} jadwal per request"}), 413
+
+        if replace and target_ids:
+            (
+                EmployeeSchedule.query
+                .filter(EmployeeSchedule.employee_id.in_(target_ids))
+                .delete(synchronize_session=False)
+            )
+
+        rows = [
+            {
+                "employee_id": employee_id,
+                "work_schedules_id": t.work_schedules_id,
+                "daily_schedules_id": t.daily_schedules_id
+            }
+            for employee_id in target_ids
+            for t in template
+        ]
+        try:
+            created = _insert_employee_schedules(rows) if rows else 0
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            return jsonify({"message": "Sebagian jadwal ditambahkan oleh request lain, silakan kirim ulang"}), 409
+        roster_cache.invalidate_employees(target_ids)
+
+        return jsonify({
+            "message": f"Jadwal berhasil disalin ke {len(target_ids)} employee",
+            "created": created,
+            "skipped": len(rows) - created
+        }), 201
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 def update_employee_schedule(id_employee, id_employee_schedule):
     try:
         data = request.get_json()
@@ -307,7 +500,7 @@ def update_employee_schedule(id_employee, id_employee_schedule):
             return jsonify({"message": "Minimal salah satu dari work_schedules_id atau daily_schedules_id harus diisi"}), 400
 
         # --- Cek apakah employee ada ---
-        employee = db.session.query(Employee).filter_by(id=id_employee).first()
+        employee = db.session.query(Employee.id).filter(Employee.id == id_employee, Employee.not_deleted()).first()
         if not employee:
             return jsonify({"message": "Employee tidak ditemukan"}), 404
 
@@ -333,7 +526,14 @@ def update_employee_schedule(id_employee, id_employee_schedule):
                 return jsonify({"message": "Daily schedule tidak ditemukan"}), 404
             schedule.daily_schedules_id = daily_schedules_id
 
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            return jsonify({"message": "Schedule untuk kombinasi ini sudah ada"}), 400
+        roster_cache.invalidate_employee(id_employee)
 
         return jsonify({
             "message": "Employee schedule berhasil diperbarui",
@@ -354,7 +554,7 @@ def update_employee_schedule(id_employee, id_employee_schedule):
 def delete_employee_schedule(id_employee, id_employee_schedule):
     try:
         # --- Cek apakah employee ada ---
-        employee = db.session.query(Employee).filter_by(id=id_employee).first()
+        employee = db.session.query(Employee.id).filter(Employee.id == id_employee, Employee.not_deleted()).first()
         if not employee:
             return jsonify({"message": "Employee tidak ditemukan"}), 404
 
@@ -369,6 +569,7 @@ def delete_employee_schedule(id_employee, id_employee_schedule):
 
         db.session.delete(schedule)
         db.session.commit()
+        roster_cache.invalidate_employee(id_employee)
 
         return jsonify({"message": "Employee schedule berhasil dihapus"}), 200
 
@@ -387,11 +588,7 @@ def create_employee():
         if not all(field in data for field in required_fields):
             return jsonify({"message": "Missing required fields"}), 400
 
-        # Cek duplikasi email/nik
-        if Employee.query.filter((Employee.email == data["email"]) | (Employee.nik == data["nik"])).first():
-            return jsonify({"message": "Employee with this email or NIK already exists"}), 409
-
-        hashed_password = generate_password_hash(data["password"], method="pbkdf2:sha256")
+        hashed_password = hash_password(data["password"])
 
         new_employee = Employee(
             nik=data["nik"],
@@ -402,10 +599,58 @@ def create_employee():
             password=hashed_password
         )
 
-        db.session.add(new_employee)
-        db.session.commit()
+        # Duplikasi email/NIK ditolak unique constraint
+        try:
+            db.session.add(new_employee)
+            db.session.flush()
+            new_id = new_employee.id
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            return jsonify({"message": "Employee with this email or NIK already exists"}), 409
+
+        return jsonify({"message": "Employee created successfully", "id": new_id}), 201
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
 
-        return jsonify({"message": "Employee created successfully", "id": new_employee.id}), 201
+def bulk_create_employees():
+    """
+    Import banyak karyawan sekaligus (onboarding site baru)
+    POST /admin/employees/bulk
+    Body: { "employees": [ { "nik", "name", "gender", "position", "email", "password" }, ... ] }
+    Response berisi status per baris sesuai urutan input. Maksimal
+    EMPLOYEE_IMPORT_MAX baris; import besar memakai `flask import-employees`.
+    """
+    try:
+        data = request.get_json() or {}
+        rows = data.get("employees")
+
+        if not isinstance(rows, list) or not rows:
+            return jsonify({"message": "employees must be a non-empty list"}), 400
+
+        max_rows = current_app.config["EMPLOYEE_IMPORT_MAX"]
+        if len(rows) > max_rows:
+            return jsonify({"message": f"Maximum {max_rows} employees per request, use `flask import-employees` for larger imports"}), 413
+
+        # Hash lewat executor verifikasi password yang terbatas, bukan process pool
+        try:
+            results = import_employees(rows, hasher=password_verifier.hash_many)
+        except PasswordVerifierBusy:
+            return busy_response()
+        created = sum(1 for r in results if r["status"] == "created")
+
+        return jsonify({
+            "message": f"{created} of {len(rows)} employees created",
+            "total": len(rows),
+            "created": created,
+            "results": results
+        }), 200
 
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -416,33 +661,44 @@ def create_employee():
 def update_employee(id_employee: int):
     try:
         data = request.get_json()
-        employee = Employee.query.get(id_employee)
-
-        if not employee:
-            return jsonify({"message": "Employee not found"}), 404
 
         # Field yang boleh diubah oleh admin
         allowed_fields = {"nik", "name", "gender", "position", "email", "password"}
 
-        # Cek duplikasi NIK/email jika ada perubahan
-        if "nik" in data and data["nik"] != employee.nik:
-            if Employee.query.filter(Employee.nik == data["nik"]).first():
-                return jsonify({"message": "NIK already exists"}), 409
+        # Field yang dikirim di request
+        values = {field: data[field] for field in allowed_fields if field in data}
+        if "password" in values:
+            # hash password baru
+            values["password"] = hash_password(values["password"])
 
-        if "email" in data and data["email"] != employee.email:
-            if Employee.query.filter(Employee.email == data["email"]).first():
-                return jsonify({"message": "Email already exists"}), 409
+        # Satu UPDATE; duplikasi NIK/email ditolak unique constraint
+        try:
+            if values:
+                updated = (
+                    Employee.query
+                    .filter(Employee.id == id_employee, Employee.not_deleted())
+                    .update(values, synchronize_session=False)
+                )
+            else:
+                updated = db.session.query(Employee.id).filter(
+                    Employee.id == id_employee, Employee.not_deleted()
+                ).count()
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            if "nik" in duplicate_key_name(e):
+                return jsonify({"message": "NIK already exists"}), 409
+            return jsonify({"message": "Email already exists"}), 409
 
-        # Update field yang dikirim di request
-        for field in allowed_fields:
-            if field in data:
-                if field == "password":
-                    # hash password baru
-                    setattr(employee, field, generate_password_hash(data[field], method='pbkdf2:sha256'))
-                else:
-                    setattr(employee, field, data[field])
+        if not updated:
+            return jsonify({"message": "Employee not found"}), 404
 
-        db.session.commit()
+        identity_cache.invalidate(id_employee)
+        if "name" in data:
+            presence.invalidate()
+            attendance_changes.notify()
 
         return jsonify({"message": "Employee updated successfully"}), 200
 
@@ -453,14 +709,34 @@ def update_employee(id_employee: int):
 
 
 def delete_employee(id_employee: int):
+    """
+    Default soft delete (set deleted_at, satu UPDATE). ?hard=true menghapus baris
+    employee langsung; attendance, jadwal dan summary ikut terhapus lewat
+    ON DELETE CASCADE di database.
+    """
     try:
-        employee = Employee.query.get(id_employee)
+        hard = request.args.get("hard", "").lower() in ("1", "true", "yes")
+        query = Employee.query.filter(Employee.id == id_employee)
+
+        if hard:
+            deleted = query.delete(synchronize_session=False)
+        else:
+            deleted = query.filter(Employee.not_deleted()).update(
+                {Employee.deleted_at: datetime.now()}, synchronize_session=False
+            )
 
-        if not employee:
+        if not deleted:
+            db.session.rollback()
             return jsonify({"message": "Employee not found"}), 404
 
-        db.session.delete(employee)
+        # Token yang masih beredar ikut dicabut (claim profil di JWT tidak dicek ke DB)
+        revoked = revocation_list.revoke_employee(id_employee)
         db.session.commit()
+        revocation_list.remember(*revoked)
+        roster_cache.invalidate_employee(id_employee)
+        identity_cache.invalidate(id_employee)
+        presence.invalidate()
+        attendance_changes.notify()
 
         return jsonify({"message": "Employee deleted successfully"}), 200
 
@@ -471,32 +747,83 @@ def delete_employee(id_employee: int):
 
 
 def get_all_work_schedules():
+    """
+    Daftar work schedule dari reference cache (ETag = versi data)
+    """
     try:
-        schedules = (
-            db.session.query(
-                WorkSchedule.id.label("id"),
-                WorkSchedule.name.label("name"),
-                WorkSchedule.start_time.label("start_time"),
-                WorkSchedule.end_time.label("end_time"),
-                WorkSchedule.tolerance_minutes.label("tolerance_minutes")
+        return reference_cache.response("work_schedules")
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+def get_work_schedule_by_id(id_schedule: int):
+    try:
+        response = reference_cache.response(("work_schedule", id_schedule))
+        if response is None:
+            return jsonify({"message": "Work schedule not found"}), 404
+
+        return response
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+
+def get_all_attendance():
+    """
+    Daftar absensi dengan keyset pagination (urut date, id terbaru dulu)
+    GET /admin/attendance?limit=&cursor=&date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&employee_id=&position=
+    Response: count (baris di halaman ini), attendances, limit, next_cursor
+    (null di halaman terakhir). Field total_attendance lama sudah dihapus.
+    """
+    try:
+        # Parse parameter pagination dan filter
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            cursor = request.args.get("cursor")
+            cursor_date, cursor_id = decode_cursor(cursor) if cursor else (None, None)
+            filters = parse_attendance_filters(request.args)
+        except ValueError:
+            return jsonify({"message": "Invalid pagination or filter parameter"}), 400
+
+        # Join tabel attendance dengan employee + filter
+        query = filtered_attendance_query(**filters)
+
+        # Lanjutkan setelah baris terakhir halaman sebelumnya
+        if cursor:
+            query = query.filter(
+                (Attendance.date < cursor_date) |
+                ((Attendance.date == cursor_date) & (Attendance.id < cursor_id))
             )
-            .order_by(WorkSchedule.id.asc())
+
+        # Ambil satu baris lebih untuk tahu apakah masih ada halaman berikutnya
+        attendances = (
+            query
+            .order_by(Attendance.date.desc(), Attendance.id.desc())
+            .limit(limit + 1)
             .all()
         )
 
-        result = []
-        for s in schedules:
-            result.append({
-                "id": s.id,
-                "name": s.name,
-                "start_time": s.start_time.strftime("%H:%M"),
-                "end_time": s.end_time.strftime("%H:%M"),
-                "tolerance_minutes": s.tolerance_minutes
-            })
+        has_more = len(attendances) > limit
+        attendances = attendances[:limit]
+
+        result = serialize_rows(attendance_row, attendances)
 
+        next_cursor = None
+        if has_more:
+            last = attendances[-1]
+            next_cursor = encode_cursor(last.attendance_date, last.attendance_id)
+
+        # "count" = jumlah baris di halaman ini; total keseluruhan tidak dihitung
+        # (COUNT(*) per halaman akan menghapus manfaat keyset pagination)
         return jsonify({
-            "total_schedules": len(result),
-            "work_schedules": result
+            "count": len(result),
+            "attendances": result,
+            "limit": limit,
+            "next_cursor": next_cursor
         }), 200
 
     except SQLAlchemyError as e:
@@ -504,32 +831,77 @@ def get_all_work_schedules():
         return jsonify({"error": str(e)}), 500
 
 
-def get_work_schedule_by_id(id_schedule: int):
+
+def export_attendance():
+    """
+    Export absensi untuk payroll, di-stream per chunk dari server-side cursor
+    GET /admin/attendance/export?format=csv|csv.gz|parquet&date_from=&date_to=&employee_id=&position=
+    parquet membutuhkan pyarrow (ada di requirements.txt); 501 jika tidak terpasang.
+    """
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
     try:
-        s = (
+        filters = parse_attendance_filters(request.args)
+    except ValueError:
+        return jsonify({"message": "Invalid filter parameter"}), 400
+
+    try:
+        body = stream_export(export_format, filters, current_app.config["EXPORT_CHUNK_SIZE"])
+    except RuntimeError as e:
+        return jsonify({"message": str(e)}), 501
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    filename = f"attendance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+
+def get_attendance_monthly_summary():
+    """
+    Ringkasan absensi per karyawan untuk satu bulan, dibaca dari tabel ringkasan
+    GET /admin/attendance/summary?month=YYYY-MM&position=
+    """
+    try:
+        try:
+            month_param = request.args.get("month")
+            month = datetime.strptime(month_param, "%Y-%m").date() if month_param else datetime.now().date().replace(day=1)
+        except ValueError:
+            return jsonify({"message": "Invalid month format. Use YYYY-MM format"}), 400
+
+        query = (
             db.session.query(
-                WorkSchedule.id,
-                WorkSchedule.name,
-                WorkSchedule.start_time,
-                WorkSchedule.end_time,
-                WorkSchedule.tolerance_minutes
+                Employee.id.label("employee_id"),
+                Employee.name.label("employee_name"),
+                Employee.position.label("position"),
+                AttendanceMonthlySummary.days_present,
+                AttendanceMonthlySummary.days_late,
+                AttendanceMonthlySummary.first_scan,
+                AttendanceMonthlySummary.last_scan
             )
-            .filter(WorkSchedule.id == id_schedule)
-            .first()
+            .join(Employee, Employee.id == AttendanceMonthlySummary.employee_id)
+            .filter(AttendanceMonthlySummary.month == month)
         )
 
-        if not s:
-            return jsonify({"message": "Work schedule not found"}), 404
+        position = request.args.get("position")
+        if position:
+            query = query.filter(Employee.position == position)
 
-        result = {
-            "id": s.id,
-            "name": s.name,
-            "start_time": s.start_time.strftime("%H:%M"),
-            "end_time": s.end_time.strftime("%H:%M"),
-            "tolerance_minutes": s.tolerance_minutes
-        }
+        summaries = query.order_by(Employee.name.asc()).all()
 
-        return jsonify(result), 200
+        result = serialize_rows(monthly_summary_row, summaries)
+
+        return jsonify({
+            "month": month.strftime("%Y-%m"),
+            "total_employees": len(result),
+            "summaries": result
+        }), 200
 
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -537,35 +909,86 @@ def get_work_schedule_by_id(id_schedule: int):
 
 
 
-def get_all_attendance():
+def get_lateness_report():
+    """
+    Laporan keterlambatan per karyawan dan per posisi dalam rentang tanggal
+    GET /admin/reports/lateness?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&position=
+    Default: bulan berjalan.
+    """
     try:
-        # Join tabel attendance dengan employee
-        attendances = (
-            db.session.query(
-                Attendance.id.label("attendance_id"),
+        try:
+            filters = parse_attendance_filters(request.args)
+        except ValueError:
+            return jsonify({"message": "Invalid filter parameter"}), 400
+
+        if not filters["date_from"] and not filters["date_to"]:
+            filters["date_from"] = datetime.now().date().replace(day=1)
+            filters["date_to"] = datetime.now().date()
+
+        is_late = case((Attendance.status == "terlambat", 1), else_=0)
+        is_on_time = case((Attendance.status == "tepat_waktu", 1), else_=0)
+
+        # Satu GROUP BY per karyawan di atas rentang tanggal yang ter-index
+        rows = (
+            filtered_attendance_query(**filters)
+            .with_entities(
                 Employee.id.label("employee_id"),
                 Employee.name.label("employee_name"),
                 Employee.position.label("position"),
-                Attendance.date.label("attendance_date")
+                db.func.count(Attendance.id).label("total"),
+                db.func.sum(is_on_time).label("on_time"),
+                db.func.sum(is_late).label("late"),
+                db.func.sum(case((Attendance.status == "terlambat", Attendance.minutes_late), else_=0)).label("minutes_late")
             )
-            .join(Employee, Employee.id == Attendance.employee_id)
-            .order_by(Attendance.date.desc())
+            .group_by(Employee.id, Employee.name, Employee.position)
+            .order_by(Employee.position.asc(), Employee.name.asc())
             .all()
         )
 
-        result = []
-        for a in attendances:
-            result.append({
-                "attendance_id": a.attendance_id,
-                "employee_id": a.employee_id,
-                "employee_name": a.employee_name,
-                "position": a.position,
-                "attendance_date": a.attendance_date.strftime("%Y-%m-%d %H:%M:%S")
+        def average(minutes, late):
+            return round(minutes / late, 1) if late else 0
+
+        per_employee = []
+        per_position = {}
+        for r in rows:
+            late = int(r.late or 0)
+            minutes = int(r.minutes_late or 0)
+            per_employee.append({
+                "employee_id": r.employee_id,
+                "employee_name": r.employee_name,
+                "position": r.position,
+                "total_attendance": r.total,
+                "on_time": int(r.on_time or 0),
+                "late": late,
+                "avg_minutes_late": average(minutes, late)
             })
 
+            # Rekap per posisi dari hasil per karyawan (O(karyawan))
+            p = per_position.setdefault(r.position, {
+                "position": r.position,
+                "employees": 0,
+                "total_attendance": 0,
+                "on_time": 0,
+                "late": 0,
+                "minutes_late": 0
+            })
+            p["employees"] += 1
+            p["total_attendance"] += r.total
+            p["on_time"] += int(r.on_time or 0)
+            p["late"] += late
+            p["minutes_late"] += minutes
+
+        position_list = []
+        for p in per_position.values():
+            minutes = p.pop("minutes_late")
+            p["avg_minutes_late"] = average(minutes, p["late"])
+            position_list.append(p)
+
         return jsonify({
-            "total_attendance": len(result),
-            "attendances": result
+            "date_from": filters["date_from"].strftime("%Y-%m-%d") if filters["date_from"] else None,
+            "date_to": filters["date_to"].strftime("%Y-%m-%d") if filters["date_to"] else None,
+            "per_employee": per_employee,
+            "per_position": position_list
         }), 200
 
     except SQLAlchemyError as e:
@@ -610,38 +1033,57 @@ def get_attendance_by_id(attendance_id: int):
 
 
 
+def _work_schedule_counts_query():
+    """
+    Work schedule beserta jumlah penugasan (employee_count) dan jumlah karyawan
+    unik (distinct_employee_count) dalam satu LEFT JOIN ... GROUP BY. Kedua
+    angka tampilan hanya menghitung karyawan yang belum di-soft-delete;
+    assignment_count menghitung semua baris employee_schedules (termasuk milik
+    karyawan soft-delete yang menunggu purge) dan dipakai untuk cek hapus.
+    """
+    active_schedule = case((Employee.not_deleted(), EmployeeSchedule.id))
+    active_employee = case((Employee.not_deleted(), EmployeeSchedule.employee_id))
+    return (
+        db.session.query(
+            WorkSchedule.id.label("id"),
+            WorkSchedule.name.label("name"),
+            WorkSchedule.start_time.label("start_time"),
+            WorkSchedule.end_time.label("end_time"),
+            WorkSchedule.tolerance_minutes.label("tolerance_minutes"),
+            WorkSchedule.created_at.label("created_at"),
+            WorkSchedule.updated_at.label("updated_at"),
+            db.func.count(active_schedule).label("employee_count"),
+            db.func.count(active_employee.distinct()).label("distinct_employee_count"),
+            db.func.count(EmployeeSchedule.id).label("assignment_count")
+        )
+        .outerjoin(EmployeeSchedule, EmployeeSchedule.work_schedules_id == WorkSchedule.id)
+        .outerjoin(Employee, Employee.id == EmployeeSchedule.employee_id)
+        .group_by(WorkSchedule.id)
+    )
+
+
+@conditional(lambda: [
+    last_updated(WorkSchedule),
+    row_count(WorkSchedule),
+    last_updated(EmployeeSchedule),
+    row_count(EmployeeSchedule),
+    # Soft delete karyawan mengubah jumlah yang ditampilkan
+    select(db.func.max(Employee.deleted_at)).scalar_subquery()
+])
 def get_all_work_schedulesOP():
     """
-    Mendapatkan semua jadwal kerja
+    Mendapatkan semua jadwal kerja beserta jumlah karyawan per jadwal
     """
     try:
         schedules = (
-            db.session.query(
-                WorkSchedule.id.label("id"),
-                WorkSchedule.name.label("name"),
-                WorkSchedule.start_time.label("start_time"),
-                WorkSchedule.end_time.label("end_time"),
-                WorkSchedule.tolerance_minutes.label("tolerance_minutes"),
-                WorkSchedule.created_at.label("created_at")
-            )
-            .order_by(WorkSchedule.created_at.desc())
+            _work_schedule_counts_query()
+            .order_by(WorkSchedule.created_at.desc(), WorkSchedule.id.desc())
             .all()
         )
 
-        result = []
-        for s in schedules:
-            result.append({
-                "id": s.id,
-                "name": s.name,
-                "start_time": s.start_time.strftime("%H:%M"),
-                "end_time": s.end_time.strftime("%H:%M"),
-                "tolerance_minutes": s.tolerance_minutes,
-                "created_at": s.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            })
-
         return jsonify({
-            "total_schedules": len(result),
-            "work_schedules": result
+            "total_schedules": len(schedules),
+            "work_schedules": serialize_rows(work_schedule_op_row, schedules)
         }), 200
 
     except SQLAlchemyError as e:
@@ -654,16 +1096,9 @@ def get_work_schedule_by_idOP(id_schedule: int):
     Mendapatkan detail jadwal kerja berdasarkan ID
     """
     try:
+        # Detail + jumlah karyawan yang menggunakan jadwal ini (satu query)
         schedule = (
-            db.session.query(
-                WorkSchedule.id.label("id"),
-                WorkSchedule.name.label("name"),
-                WorkSchedule.start_time.label("start_time"),
-                WorkSchedule.end_time.label("end_time"),
-                WorkSchedule.tolerance_minutes.label("tolerance_minutes"),
-                WorkSchedule.created_at.label("created_at"),
-                WorkSchedule.updated_at.label("updated_at")
-            )
+            _work_schedule_counts_query()
             .filter(WorkSchedule.id == id_schedule)
             .first()
         )
@@ -671,13 +1106,6 @@ def get_work_schedule_by_idOP(id_schedule: int):
         if not schedule:
             return jsonify({"message": "Work schedule not found"}), 404
 
-        # Hitung jumlah karyawan yang menggunakan jadwal ini
-        employee_count = (
-            db.session.query(EmployeeSchedule)
-            .filter(EmployeeSchedule.work_schedules_id == id_schedule)
-            .count()
-        )
-
         result = {
             "id": schedule.id,
             "name": schedule.name,
@@ -686,7 +1114,8 @@ def get_work_schedule_by_idOP(id_schedule: int):
             "tolerance_minutes": schedule.tolerance_minutes,
             "created_at": schedule.created_at.strftime("%Y-%m-%d %H:%M:%S"),
             "updated_at": schedule.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "employee_count": employee_count
+            "employee_count": schedule.employee_count,
+            "distinct_employee_count": schedule.distinct_employee_count
         }
 
         return jsonify(result), 200
@@ -708,10 +1137,6 @@ def create_work_scheduleOP():
         if not all(field in data for field in required_fields):
             return jsonify({"message": "Missing required fields"}), 400
 
-        # Cek duplikasi nama jadwal
-        if WorkSchedule.query.filter(WorkSchedule.name == data["name"]).first():
-            return jsonify({"message": "Work schedule with this name already exists"}), 409
-
         # Parse waktu dari string HH:MM ke time object
         try:
             start_time = datetime.strptime(data["start_time"], "%H:%M").time()
@@ -730,12 +1155,22 @@ def create_work_scheduleOP():
             tolerance_minutes=data.get("tolerance_minutes", 0)
         )
 
-        db.session.add(new_schedule)
-        db.session.commit()
+        # Nama duplikat ditolak unique constraint
+        try:
+            db.session.add(new_schedule)
+            db.session.flush()
+            new_id = new_schedule.id
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            return jsonify({"message": "Work schedule with this name already exists"}), 409
+        reference_cache.bump()
 
         return jsonify({
             "message": "Work schedule created successfully",
-            "id": new_schedule.id
+            "id": new_id
         }), 201
 
     except SQLAlchemyError as e:
@@ -754,11 +1189,6 @@ def update_work_scheduleOP(id_schedule: int):
         if not schedule:
             return jsonify({"message": "Work schedule not found"}), 404
 
-        # Cek duplikasi nama jika ada perubahan
-        if "name" in data and data["name"] != schedule.name:
-            if WorkSchedule.query.filter(WorkSchedule.name == data["name"]).first():
-                return jsonify({"message": "Work schedule name already exists"}), 409
-
         # Update nama jika ada
         if "name" in data:
             schedule.name = data["name"]
@@ -785,7 +1215,16 @@ def update_work_scheduleOP(id_schedule: int):
         if "tolerance_minutes" in data:
             schedule.tolerance_minutes = data["tolerance_minutes"]
 
-        db.session.commit()
+        # Nama duplikat ditolak unique constraint
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            return jsonify({"message": "Work schedule name already exists"}), 409
+        roster_cache.invalidate_work_schedule(id_schedule)
+        reference_cache.bump()
 
         return jsonify({"message": "Work schedule updated successfully"}), 200
 
@@ -799,28 +1238,84 @@ def delete_work_scheduleOP(id_schedule: int):
     Menghapus jadwal kerja
     """
     try:
-        schedule = WorkSchedule.query.get(id_schedule)
+        # Cek keberadaan jadwal dan apakah sedang digunakan karyawan (satu query)
+        schedule = (
+            _work_schedule_counts_query()
+            .filter(WorkSchedule.id == id_schedule)
+            .first()
+        )
 
         if not schedule:
             return jsonify({"message": "Work schedule not found"}), 404
 
-        # Cek apakah jadwal sedang digunakan oleh karyawan
-        employee_count = (
-            db.session.query(EmployeeSchedule)
-            .filter(EmployeeSchedule.work_schedules_id == id_schedule)
-            .count()
-        )
-
-        if employee_count > 0:
+        # Semua penugasan (termasuk karyawan soft-delete) tetap mereferensikan jadwal ini
+        if schedule.assignment_count > 0:
             return jsonify({
-                "message": f"Cannot delete work schedule. It is currently assigned to {employee_count} employee(s)"
+                "message": f"Cannot delete work schedule. It is currently used by {schedule.assignment_count} employee schedule(s)"
             }), 409
 
-        db.session.delete(schedule)
+        WorkSchedule.query.filter(WorkSchedule.id == id_schedule).delete(synchronize_session=False)
         db.session.commit()
+        roster_cache.invalidate_work_schedule(id_schedule)
+        reference_cache.bump()
 
         return jsonify({"message": "Work schedule deleted successfully"}), 200
 
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@jwt_required()
+def get_current_qr_code():
+    """
+    QR code absensi yang berlaku saat ini, untuk ditampilkan di layar lokasi.
+    GET /api/admin/qr/current?site=main
+    Header: Authorization: Bearer <token admin>
+    Layar sebaiknya meminta ulang setelah `expires_in` detik.
+    """
+    current_user = get_jwt_identity()
+    if current_user.get('role') != 'admin':
+        return jsonify({"message": "Unauthorized"}), 403
+
+    try:
+        code = current_qr_code(request.args.get('site', 'main'))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    response = jsonify(code)
+    response.headers["Cache-Control"] = "no-store"
+    return response, 200
+
+
+def get_cache_stats():
+    """
+    Statistik cache in-process pada worker yang melayani request ini
+    """
+    return jsonify({
+        "roster": roster_cache.stats(),
+        "presence": presence.stats(),
+        "password_verifier": password_verifier.stats(),
+        "identity": identity_cache.stats(),
+        "revocation": revocation_list.stats(),
+        "qr_replay": replay_cache.stats(),
+        "reference": reference_cache.stats(),
+        "dashboard": dashboard_cache.stats()
+    }), 200
+
+
+def get_today_dashboard():
+    """
+    Ringkasan absensi hari ini untuk dashboard admin: jumlah terjadwal, hadir,
+    tepat waktu, terlambat dan belum hadir (shift yang sudah mulai), total dan
+    per shift. Dihitung dengan satu query agregat dan di-cache beberapa detik.
+    GET /api/admin/dashboard/today
+    """
+    try:
+        response = current_app.response_class(dashboard_cache.get(), mimetype=current_app.json.mimetype)
+        response.headers["Cache-Control"] = f"private, max-age={current_app.config['DASHBOARD_CACHE_SECONDS']}"
+        return response
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
@@ -1,9 +1,21 @@
-from flask import jsonify, request
-from sqlalchemy.exc import SQLAlchemyError
-from werkzeug.security import check_password_hash
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask import jsonify, request, current_app, Response, stream_with_context
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token, jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timedelta
-from ..models import db, Employee, EmployeeSchedule, WorkSchedule, Attendance, DailySchedule
+from ..models import db, Employee, EmployeeSchedule, WorkSchedule, Attendance, DailySchedule, Admin
+from ..utils.attendance_summary import record_scan, record_scans, refresh_summary
+from ..utils.conditional import conditional, last_updated, row_count, employee_schedules_validator
+from ..utils.date_helper import HARI, day_range, week_range, month_range
+from ..utils.db_errors import is_duplicate_key, duplicate_key_name
+from ..utils.identity_cache import identity_cache
+from ..utils.password import password_verifier, PasswordVerifierBusy, busy_response, hash_password, rehash_password
+from ..utils.presence import presence
+from ..utils.qr_code import verify_qr_code, release_qr_code, QRCodeInvalid, QRCodeReplayed
+from ..utils.revocation import revocation_list
+from ..utils.serializers import serialize_rows, employee_shift_row, presence_row
+from ..utils.sse import attendance_changes, sse_event
+from ..utils.roster_cache import roster_cache, punctuality_status, minutes_late
 
 
 def login():
@@ -23,25 +35,48 @@ def login():
         password = data.get('password')
         
         # Cari employee berdasarkan email
-        employee = Employee.query.filter_by(email=email).first()
+        employee = Employee.query.filter(Employee.email == email, Employee.not_deleted()).first()
         
         if not employee:
             return jsonify({"message": "Email atau password salah"}), 401
         
-        # Verifikasi password
-        if not check_password_hash(employee.password, password):
+        # Verifikasi password (executor terbatas)
+        try:
+            password_valid = password_verifier.verify(employee.password, password)
+        except PasswordVerifierBusy:
+            return busy_response()
+
+        if not password_valid:
             return jsonify({"message": "Email atau password salah"}), 401
         
-        # Generate JWT token (expired dalam 7 hari)
+        # Hash ulang ke kebijakan hash terbaru jika perlu
+        rehash_password(employee, password)
+        
+        # Generate JWT access token (berumur pendek) + refresh token.
+        # Profil ikut ditandatangani sebagai claim supaya /verify tidak perlu query database.
+        identity = {'id': employee.id, 'role': 'employee'}
+        profile_claims = {
+            'name': employee.name,
+            'email': employee.email,
+            'position': employee.position
+        }
         access_token = create_access_token(
-            identity={'id': employee.id, 'role': 'employee'},
-            expires_delta=timedelta(days=7)
+            identity=identity,
+            additional_claims=profile_claims,
+            expires_delta=current_app.config["ACCESS_TOKEN_EXPIRES"]
+        )
+        refresh_token = create_refresh_token(
+            identity=identity,
+            additional_claims=profile_claims,
+            expires_delta=current_app.config["REFRESH_TOKEN_EXPIRES"]
         )
+        identity_cache.put(employee)
         
         # Return data employee + token
         return jsonify({
             "message": "Login berhasil",
             "token": access_token,
+            "refresh_token": refresh_token,
             "id": employee.id,
             "employee_id": employee.id,
             "name": employee.name,
@@ -70,20 +105,12 @@ def register():
             if not data.get(field):
                 return jsonify({"message": f"{field} harus diisi"}), 400
         
-        # Cek apakah email atau NIK sudah ada
-        if Employee.query.filter_by(email=data['email']).first():
-            return jsonify({"message": "Email sudah terdaftar"}), 409
-        
-        if Employee.query.filter_by(nik=data['nik']).first():
-            return jsonify({"message": "NIK sudah terdaftar"}), 409
-        
         # Validasi gender
         if data['gender'] not in ['Male', 'Female', 'Other']:
             return jsonify({"message": "Gender tidak valid"}), 400
         
         # Hash password
-        from werkzeug.security import generate_password_hash
-        hashed_password = generate_password_hash(data['password'], method='pbkdf2:sha256')
+        hashed_password = hash_password(data['password'])
         
         # Buat employee baru
         new_employee = Employee(
@@ -95,14 +122,25 @@ def register():
             password=hashed_password
         )
         
-        db.session.add(new_employee)
-        db.session.commit()
+        # Email/NIK yang sudah terdaftar ditolak unique constraint
+        try:
+            db.session.add(new_employee)
+            db.session.flush()
+            new_id = new_employee.id
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            if "nik" in duplicate_key_name(e):
+                return jsonify({"message": "NIK sudah terdaftar"}), 409
+            return jsonify({"message": "Email sudah terdaftar"}), 409
         
         return jsonify({
             "message": "Registrasi berhasil",
-            "employee_id": new_employee.id,
-            "name": new_employee.name,
-            "email": new_employee.email
+            "employee_id": new_id,
+            "name": data['name'],
+            "email": data['email']
         }), 201
         
     except SQLAlchemyError as e:
@@ -122,24 +160,115 @@ def verify_token():
     try:
         current_user = get_jwt_identity()
         employee_id = current_user.get('id')
-        
-        employee = Employee.query.get(employee_id)
+        claims = get_jwt()
+
+        # Profil dari claim token; employee yang dihapus sudah ditolak oleh
+        # revocation list. Database hanya dibaca untuk token lama tanpa claim.
+        if claims.get("name") is not None:
+            employee = {
+                "id": employee_id,
+                "name": claims["name"],
+                "email": claims.get("email"),
+                "position": claims.get("position")
+            }
+        else:
+            employee = identity_cache.resolve(employee_id)
         if not employee:
             return jsonify({"message": "User tidak ditemukan"}), 404
         
         return jsonify({
             "message": "Token valid",
-            "id": employee.id,
-            "employee_id": employee.id,
-            "name": employee.name,
-            "email": employee.email,
-            "position": employee.position
+            "id": employee["id"],
+            "employee_id": employee["id"],
+            "name": employee["name"],
+            "email": employee["email"],
+            "position": employee["position"]
         }), 200
         
     except Exception as e:
         return jsonify({"message": "Token tidak valid", "error": str(e)}), 401
 
 
+@jwt_required(refresh=True)
+def refresh_access_token():
+    """
+    Endpoint untuk mendapatkan access token baru dari refresh token
+    POST /api/auth/refresh
+    Header: Authorization: Bearer <refresh_token>
+    """
+    try:
+        current_user = get_jwt_identity()
+        identity = {'id': current_user.get('id'), 'role': current_user.get('role')}
+        additional_claims = {}
+
+        # Refresh jarang terjadi: selalu cek ke database (bukan claim token) supaya
+        # user yang sudah dihapus tidak bisa terus memperpanjang akses
+        if identity['role'] == 'employee':
+            employee = (
+                db.session.query(Employee.id, Employee.name, Employee.email, Employee.position)
+                .filter(Employee.id == identity['id'], Employee.not_deleted())
+                .first()
+            )
+            if not employee:
+                return jsonify({"message": "User tidak ditemukan"}), 401
+            identity_cache.put(employee)
+            additional_claims = {
+                'name': employee.name,
+                'email': employee.email,
+                'position': employee.position
+            }
+        elif not db.session.query(Admin.id).filter(Admin.id == identity['id']).first():
+            return jsonify({"message": "User tidak ditemukan"}), 401
+
+        access_token = create_access_token(
+            identity=identity,
+            additional_claims=additional_claims,
+            expires_delta=current_app.config["ACCESS_TOKEN_EXPIRES"]
+        )
+
+        return jsonify({
+            "message": "Token diperbarui",
+            "token": access_token,
+            "access_token": access_token
+        }), 200
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"message": "Database error", "error": str(e)}), 500
+    except Exception as e:
+        return jsonify({"message": "Internal server error", "error": str(e)}), 500
+
+
+@jwt_required(verify_type=False)
+def logout():
+    """
+    Endpoint logout: mencabut token yang dipakai (dan refresh token jika dikirim)
+    POST /api/auth/logout
+    Header: Authorization: Bearer <token>
+    Body (opsional): { "refresh_token": "..." }
+    """
+    try:
+        revocation_list.revoke(get_jwt())
+
+        data = request.get_json(silent=True) or {}
+        if data.get('refresh_token'):
+            try:
+                refresh_payload = decode_token(data['refresh_token'])
+            except Exception:
+                return jsonify({"message": "Refresh token tidak valid"}), 400
+            if refresh_payload.get('sub') != get_jwt().get('sub'):
+                return jsonify({"message": "Unauthorized"}), 403
+            revocation_list.revoke(refresh_payload)
+
+        return jsonify({"message": "Logout berhasil"}), 200
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"message": "Database error", "error": str(e)}), 500
+    except Exception as e:
+        return jsonify({"message": "Internal server error", "error": str(e)}), 500
+
+
 @jwt_required()
 def change_password():
     """
@@ -161,17 +290,21 @@ def change_password():
         if len(new_password) < 6:
             return jsonify({"message": "Password baru minimal 6 karakter"}), 400
         
-        employee = Employee.query.get(employee_id)
+        employee = Employee.query.filter(Employee.id == employee_id, Employee.not_deleted()).first()
         if not employee:
             return jsonify({"message": "User tidak ditemukan"}), 404
         
         # Verifikasi password lama
-        if not check_password_hash(employee.password, old_password):
+        try:
+            password_valid = password_verifier.verify(employee.password, old_password)
+        except PasswordVerifierBusy:
+            return busy_response()
+
+        if not password_valid:
             return jsonify({"message": "Password lama tidak sesuai"}), 401
         
         # Update password
-        from werkzeug.security import generate_password_hash
-        employee.password = generate_password_hash(new_password, method='pbkdf2:sha256')
+        employee.password = hash_password(new_password)
         db.session.commit()
         
         return jsonify({"message": "Password berhasil diubah"}), 200
@@ -186,42 +319,18 @@ def change_password():
 
 def get_employee_today_status(id_employee: int):
     try:
-        # 1️⃣ Pastikan karyawan ada
-        employee = Employee.query.get(id_employee)
-        if not employee:
-            return jsonify({"message": "Employee not found"}), 404
-
-        # 2️⃣ Dapatkan nama hari sekarang (dalam bahasa Indonesia)
-        hari_mapping = {
-            "Monday": "Senin",
-            "Tuesday": "Selasa",
-            "Wednesday": "Rabu",
-            "Thursday": "Kamis",
-            "Friday": "Jumat",
-            "Saturday": "Sabtu",
-            "Sunday": "Minggu",
-        }
-        today_en = datetime.now().strftime("%A")
-        today_name = hari_mapping[today_en]
-
-        # 3️⃣ Ambil jadwal kerja karyawan untuk hari ini
-        schedule = (
-            db.session.query(
-                WorkSchedule.start_time,
-                WorkSchedule.end_time,
-                WorkSchedule.tolerance_minutes,
-                WorkSchedule.name.label("shift_name"),
-                DailySchedule.name.label("day_name")
-            )
-            .join(EmployeeSchedule, EmployeeSchedule.work_schedules_id == WorkSchedule.id)
-            .join(DailySchedule, DailySchedule.id == EmployeeSchedule.daily_schedules_id)
-            .filter(EmployeeSchedule.employee_id == id_employee)
-            .filter(DailySchedule.name == today_name)
-            .first()
-        )
+        # 1️⃣ Dapatkan index hari sekarang (0 = Senin)
+        today_weekday = datetime.now().weekday()
+
+        # 2️⃣ Ambil jadwal kerja karyawan untuk hari ini (dari roster cache)
+        schedule = roster_cache.get(id_employee, today_weekday)
 
         # Kalau tidak ada jadwal untuk hari ini
         if not schedule:
+            # 3️⃣ Pastikan karyawan ada (karyawan yang punya jadwal pasti ada)
+            if not db.session.query(Employee.id).filter(Employee.id == id_employee, Employee.not_deleted()).first():
+                return jsonify({"message": "Employee not found"}), 404
+
             return jsonify({
                 "absen_status_today": "none",
                 "employee_id": id_employee,
@@ -229,16 +338,8 @@ def get_employee_today_status(id_employee: int):
                 "end_time": None
             }), 200
 
-        # 4️⃣ Cek apakah sudah absen hari ini
-        today_date = datetime.now().date()
-        attendance_today = (
-            Attendance.query
-            .filter(
-                Attendance.employee_id == id_employee,
-                db.func.date(Attendance.date) == today_date
-            )
-            .first()
-        )
+        # 4️⃣ Cek apakah sudah absen hari ini (dari presence set)
+        attendance_today = presence.get(id_employee)
 
         absen_status = "present" if attendance_today else "none"
 
@@ -260,6 +361,7 @@ def get_employee_today_status(id_employee: int):
 
 
 
+@conditional(employee_schedules_validator)
 def get_employee_schedules(employee_id):
     # Query join 3 tabel
     schedules = (
@@ -273,7 +375,8 @@ def get_employee_schedules(employee_id):
         )
         .join(DailySchedule, EmployeeSchedule.daily_schedules_id == DailySchedule.id)
         .join(WorkSchedule, EmployeeSchedule.work_schedules_id == WorkSchedule.id)
-        .filter(EmployeeSchedule.employee_id == employee_id)
+        .join(Employee, Employee.id == EmployeeSchedule.employee_id)
+        .filter(EmployeeSchedule.employee_id == employee_id, Employee.not_deleted())
         .order_by(DailySchedule.id.asc())
         .all()
     )
@@ -286,17 +389,7 @@ def get_employee_schedules(employee_id):
         }), 200
 
     # Format hasil
-    result = [
-        {
-            "schedule_id": s.id,
-            "day_name": s.day_name,
-            "shift_name": s.shift_name,
-            "start_time": s.start_time.strftime("%H:%M"),
-            "end_time": s.end_time.strftime("%H:%M"),
-            "tolerance_minutes": s.tolerance_minutes
-        }
-        for s in schedules
-    ]
+    result = serialize_rows(employee_shift_row, schedules)
 
     return jsonify({
         "employee_id": employee_id,
@@ -308,23 +401,19 @@ def get_employee_schedules(employee_id):
 
 def get_attendance_history(employee_id):
     # Pastikan employee ada
-    employee = Employee.query.get(employee_id)
+    employee = Employee.query.filter(Employee.id == employee_id, Employee.not_deleted()).first()
     if not employee:
         return jsonify({"message": f"Employee dengan id {employee_id} tidak ditemukan"}), 404
 
     # Ambil waktu sekarang
     now = datetime.now()
 
-    # Hitung rentang minggu ini (Senin - Minggu)
-    start_of_week = now - timedelta(days=now.weekday())  # Senin
-    end_of_week = start_of_week + timedelta(days=6)      # Minggu
+    # Hitung rentang minggu ini (Senin - Minggu), batas akhir eksklusif
+    start_of_week, next_week = week_range(now.date())
+    end_of_week = next_week - timedelta(days=1)          # Minggu
 
-    # Hitung rentang bulan ini
-    start_of_month = datetime(now.year, now.month, 1)
-    if now.month == 12:
-        next_month = datetime(now.year + 1, 1, 1)
-    else:
-        next_month = datetime(now.year, now.month + 1, 1)
+    # Hitung rentang bulan ini, batas akhir eksklusif
+    start_of_month, next_month = month_range(now.date())
     end_of_month = next_month - timedelta(seconds=1)
 
     # Query absensi minggu ini
@@ -333,7 +422,7 @@ def get_attendance_history(employee_id):
         .filter(
             Attendance.employee_id == employee_id,
             Attendance.date >= start_of_week,
-            Attendance.date <= end_of_week
+            Attendance.date < next_week
         )
         .order_by(Attendance.date.asc())
         .all()
@@ -345,7 +434,7 @@ def get_attendance_history(employee_id):
         .filter(
             Attendance.employee_id == employee_id,
             Attendance.date >= start_of_month,
-            Attendance.date <= end_of_month
+            Attendance.date < next_month
         )
         .order_by(Attendance.date.asc())
         .all()
@@ -378,9 +467,13 @@ def get_attendance_history(employee_id):
 
 
 
+@conditional(lambda employee_id: [
+    last_updated(Employee, Employee.id == employee_id),
+    row_count(Employee, Employee.id == employee_id)
+])
 def get_employee_detail(employee_id):
     # Cek apakah employee ada
-    employee = Employee.query.get(employee_id)
+    employee = Employee.query.filter(Employee.id == employee_id, Employee.not_deleted()).first()
     if not employee:
         return jsonify({
             "message": f"Employee dengan id {employee_id} tidak ditemukan"
@@ -411,6 +504,7 @@ def scan_qr_attendance():
     Body: { "qr_data": "...", "employee_id": ... }
     Header: Authorization: Bearer <token>
     """
+    qr_claim = None
     try:
         # Ambil data dari request
         data = request.get_json()
@@ -426,104 +520,284 @@ def scan_qr_attendance():
         if current_user.get('id') != employee_id:
             return jsonify({"message": "Unauthorized: Employee ID tidak sesuai"}), 403
         
+        # Validasi QR Code bertanda tangan (HMAC, berganti tiap QR_ROTATION_SECONDS)
+        # sepenuhnya di memori, sebelum query database apa pun
+        # Klaim replay dilepas lagi di semua jalur yang tidak mencatat absensi
+        try:
+            qr_claim = verify_qr_code(qr_data, employee_id)
+        except QRCodeReplayed as e:
+            return jsonify({"message": str(e)}), 409
+        except QRCodeInvalid as e:
+            return jsonify({"message": str(e)}), 400
+        
         # Pastikan employee ada
-        employee = Employee.query.get(employee_id)
+        employee = Employee.query.filter(Employee.id == employee_id, Employee.not_deleted()).first()
         if not employee:
+            release_qr_code(qr_claim)
             return jsonify({"message": "Employee tidak ditemukan"}), 404
-        
-        # Validasi QR Code (opsional: sesuaikan dengan format QR Anda)
-        # Contoh: QR harus berisi keyword tertentu
-        if "ATTENDANCE" not in qr_data.upper():
-            return jsonify({"message": "QR Code tidak valid"}), 400
+        employee_name = employee.name
         
         # Dapatkan hari sekarang
-        hari_mapping = {
-            "Monday": "Senin",
-            "Tuesday": "Selasa",
-            "Wednesday": "Rabu",
-            "Thursday": "Kamis",
-            "Friday": "Jumat",
-            "Saturday": "Sabtu",
-            "Sunday": "Minggu",
-        }
-        today_en = datetime.now().strftime("%A")
-        today_name = hari_mapping[today_en]
-        today_date = datetime.now().date()
-        current_time = datetime.now().time()
-        
-        # Cek apakah karyawan punya jadwal hari ini
-        schedule = (
-            db.session.query(
-                WorkSchedule.start_time,
-                WorkSchedule.end_time,
-                WorkSchedule.tolerance_minutes,
-                WorkSchedule.name.label("shift_name")
-            )
-            .join(EmployeeSchedule, EmployeeSchedule.work_schedules_id == WorkSchedule.id)
-            .join(DailySchedule, DailySchedule.id == EmployeeSchedule.daily_schedules_id)
-            .filter(EmployeeSchedule.employee_id == employee_id)
-            .filter(DailySchedule.name == today_name)
-            .first()
-        )
+        now = datetime.now()
+        today_name = HARI[now.weekday()]
+        today_date = now.date()
+        
+        # Cek apakah karyawan punya jadwal hari ini (dari roster cache)
+        schedule = roster_cache.get(employee_id, now.weekday())
         
         if not schedule:
+            release_qr_code(qr_claim)
             return jsonify({
                 "message": f"Anda tidak memiliki jadwal kerja pada hari {today_name}"
             }), 400
         
-        # Cek apakah sudah absen hari ini
-        existing_attendance = (
-            Attendance.query
-            .filter(
-                Attendance.employee_id == employee_id,
-                db.func.date(Attendance.date) == today_date
-            )
-            .first()
-        )
-        
-        if existing_attendance:
-            return jsonify({
-                "message": "Anda sudah melakukan absensi hari ini",
-                "attendance_id": existing_attendance.id,
-                "time": existing_attendance.created_at.strftime("%H:%M:%S")
-            }), 409
-        
         # Cek apakah masih dalam toleransi waktu
         start_time = schedule.start_time
-        tolerance = schedule.tolerance_minutes
-        
-        # Hitung waktu maksimal absen (start_time + tolerance)
-        max_time_datetime = datetime.combine(today_date, start_time) + timedelta(minutes=tolerance)
-        max_time = max_time_datetime.time()
+        status = punctuality_status(schedule, now)
         
-        # Status absensi
-        status = "tepat_waktu"
-        if current_time > max_time:
-            status = "terlambat"
-        
-        # Simpan absensi
+        # Simpan absensi langsung; unique (employee_id, attendance_day) yang
+        # menolak absensi kedua di hari yang sama, tanpa SELECT terlebih dahulu
         new_attendance = Attendance(
             employee_id=employee_id,
-            date=datetime.now()
+            date=now,
+            status=status,
+            minutes_late=minutes_late(schedule, now)
         )
         
-        db.session.add(new_attendance)
-        db.session.commit()
+        try:
+            db.session.add(new_attendance)
+            db.session.flush()
+            attendance_id = new_attendance.id
+            record_scan(employee_id, now, status == "terlambat")
+            db.session.commit()
+            presence.add(attendance_id, employee_id, employee_name, now)
+            attendance_changes.notify()
+        except IntegrityError as e:
+            db.session.rollback()
+            if not is_duplicate_key(e):
+                raise
+            release_qr_code(qr_claim)
+            
+            day_start, day_end = day_range(today_date)
+            existing_attendance = (
+                Attendance.query
+                .filter(
+                    Attendance.employee_id == employee_id,
+                    Attendance.date >= day_start,
+                    Attendance.date < day_end
+                )
+                .first()
+            )
+            return jsonify({
+                "message": "Anda sudah melakukan absensi hari ini",
+                "attendance_id": existing_attendance.id if existing_attendance else None,
+                "time": existing_attendance.created_at.strftime("%H:%M:%S") if existing_attendance else None
+            }), 409
         
         return jsonify({
             "message": f"Absensi berhasil! Status: {status}",
-            "attendance_id": new_attendance.id,
-            "employee_name": employee.name,
+            "attendance_id": attendance_id,
+            "employee_name": employee_name,
             "shift": schedule.shift_name,
-            "attendance_time": new_attendance.created_at.strftime("%H:%M:%S"),
+            "attendance_time": now.strftime("%H:%M:%S"),
             "scheduled_time": start_time.strftime("%H:%M"),
             "status": status
         }), 201
         
     except SQLAlchemyError as e:
         db.session.rollback()
+        release_qr_code(qr_claim)
+        return jsonify({"message": "Database error", "error": str(e)}), 500
+    except Exception as e:
+        release_qr_code(qr_claim)
+        return jsonify({"message": "Internal server error", "error": str(e)}), 500
+
+
+@jwt_required()
+def scan_qr_attendance_batch():
+    """
+    Endpoint untuk replay scan dari kiosk offline / antrian retry mobile
+    POST /api/attendance/scan/batch
+    Body: { "scans": [ { "employee_id": ..., "qr_data": "...", "scanned_at": "YYYY-MM-DD HH:MM:SS" }, ... ] }
+    Header: Authorization: Bearer <token>
+
+    Cek roster memakai roster cache, cek "sudah absen" dengan satu query untuk
+    seluruh batch, dan semua absensi baru disimpan dengan satu INSERT multi-row
+    dalam satu transaksi. Response berisi status per record sesuai urutan input.
+    scanned_at harus berada di jendela QR yang ditandatangani dan tidak lebih tua
+    dari SCAN_MAX_OFFLINE_HOURS (status "expired").
+    """
+    qr_claims = {}
+    try:
+        data = request.get_json() or {}
+        scans = data.get('scans')
+
+        if not isinstance(scans, list) or not scans:
+            return jsonify({"message": "scans harus berupa list dan tidak boleh kosong"}), 400
+
+        max_batch = current_app.config["SCAN_BATCH_MAX"]
+        if len(scans) > max_batch:
+            return jsonify({"message": f"Maksimal {max_batch} scan per batch"}), 413
+
+        current_user = get_jwt_identity()
+        is_admin = current_user.get('role') == 'admin'
+        now = datetime.now()
+        oldest = now - timedelta(hours=current_app.config["SCAN_MAX_OFFLINE_HOURS"])
+
+        results = [None] * len(scans)
+        pending = []
+
+        # 1️⃣ Validasi per record (tanpa database)
+        for index, scan in enumerate(scans):
+            scan = scan if isinstance(scan, dict) else {}
+            employee_id = scan.get('employee_id')
+            qr_data = scan.get('qr_data')
+            result = {"index": index, "employee_id": employee_id}
+            results[index] = result
+
+            if not qr_data or not isinstance(employee_id, int):
+                result["status"] = "invalid"
+                continue
+
+            if not is_admin and current_user.get('id') != employee_id:
+                result["status"] = "forbidden"
+                continue
+
+            try:
+                scanned_at = datetime.fromisoformat(scan['scanned_at']) if scan.get('scanned_at') else now
+            except (TypeError, ValueError):
+                result["status"] = "invalid"
+                continue
+
+            if scanned_at.tzinfo is not None or scanned_at > now + timedelta(minutes=5):
+                result["status"] = "invalid"
+                continue
+
+            if scanned_at < oldest:
+                result["status"] = "expired"
+                continue
+
+            # QR harus berlaku pada saat scan dilakukan: scanned_at wajib jatuh di
+            # jendela waktu QR (plus QR_GRACE_WINDOWS), jadi QR lama tidak bisa
+            # dipakai untuk memundurkan jam absen
+            try:
+                qr_claims[index] = verify_qr_code(qr_data, employee_id, scanned_at.timestamp())
+            except QRCodeReplayed:
+                result["status"] = "replayed_qr"
+                continue
+            except QRCodeInvalid:
+                result["status"] = "invalid_qr"
+                continue
+
+            pending.append((result, employee_id, scanned_at))
+
+        # 2️⃣ Employee yang ada (satu query)
+        employee_ids = {employee_id for _, employee_id, _ in pending}
+        existing_employees = set()
+        if employee_ids:
+            existing_employees = {
+                row.id for row in db.session.query(Employee.id).filter(Employee.id.in_(employee_ids), Employee.not_deleted())
+            }
+
+        # 3️⃣ Absensi yang sudah ada pada hari-hari di batch (satu query)
+        present = set()
+        if pending:
+            range_start = day_range(min(scanned_at for _, _, scanned_at in pending).date())[0]
+            range_end = day_range(max(scanned_at for _, _, scanned_at in pending).date())[1]
+            present = {
+                (row.employee_id, row.date.date())
+                for row in db.session.query(Attendance.employee_id, Attendance.date)
+                .filter(
+                    Attendance.employee_id.in_(employee_ids),
+                    Attendance.date >= range_start,
+                    Attendance.date < range_end
+                )
+            }
+
+        # 4️⃣ Cek roster + duplikasi, kumpulkan baris baru
+        new_rows = []
+        for result, employee_id, scanned_at in pending:
+            if employee_id not in existing_employees:
+                result["status"] = "not_found"
+                continue
+
+            schedule = roster_cache.get(employee_id, scanned_at.weekday())
+            if not schedule:
+                result["status"] = "no_schedule"
+                continue
+
+            key = (employee_id, scanned_at.date())
+            if key in present:
+                result["status"] = "duplicate"
+                continue
+            present.add(key)
+
+            result["status"] = "recorded"
+            result["attendance_status"] = punctuality_status(schedule, scanned_at)
+            result["scanned_at"] = scanned_at.strftime("%Y-%m-%d %H:%M:%S")
+            new_rows.append((result, {
+                "employee_id": employee_id,
+                "date": scanned_at,
+                "status": result["attendance_status"],
+                "minutes_late": minutes_late(schedule, scanned_at)
+            }))
+
+        # 5️⃣ Satu INSERT multi-row dalam savepoint. Jika bentrok dengan scan lain yang
+        # masuk bersamaan, INSERT diulang per baris dengan savepoint supaya hanya
+        # record yang bentrok yang ditandai "duplicate" dan sisanya tetap tercatat
+        recorded = []
+        if new_rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Attendance), [row for _, row in new_rows])
+                recorded = new_rows
+            except IntegrityError as e:
+                if not is_duplicate_key(e):
+                    raise
+                for result, row in new_rows:
+                    try:
+                        with db.session.begin_nested():
+                            db.session.execute(insert(Attendance), row)
+                        recorded.append((result, row))
+                    except IntegrityError as e:
+                        if not is_duplicate_key(e):
+                            raise
+                        result["status"] = "duplicate"
+                        del result["attendance_status"], result["scanned_at"]
+
+            # Tambahkan ke ringkasan bulanan secara incremental (UPDATE lalu INSERT),
+            # sama seperti scan tunggal
+            record_scans(
+                (row["employee_id"], row["date"], row["status"] == "terlambat")
+                for _, row in recorded
+            )
+
+            db.session.commit()
+            if recorded:
+                # Id baris baru tidak diketahui dari INSERT multi-row, muat ulang saat dibutuhkan
+                presence.invalidate()
+                attendance_changes.notify()
+
+        # Klaim replay hanya dipertahankan untuk scan yang tercatat
+        for index, claim in qr_claims.items():
+            if results[index]["status"] != "recorded":
+                release_qr_code(claim)
+
+        return jsonify({
+            "message": f"{len(recorded)} dari {len(scans)} scan berhasil dicatat",
+            "total": len(scans),
+            "recorded": len(recorded),
+            "results": results
+        }), 200
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        for claim in qr_claims.values():
+            release_qr_code(claim)
         return jsonify({"message": "Database error", "error": str(e)}), 500
     except Exception as e:
+        for claim in qr_claims.values():
+            release_qr_code(claim)
         return jsonify({"message": "Internal server error", "error": str(e)}), 500
 
 
@@ -544,8 +818,16 @@ def delete_attendance(attendance_id):
         if current_user.get('id') != attendance.employee_id and current_user.get('role') != 'admin':
             return jsonify({"message": "Unauthorized"}), 403
         
+        employee_id = attendance.employee_id
+        attendance_date = attendance.date
+
         db.session.delete(attendance)
+        if attendance_date:
+            db.session.flush()
+            refresh_summary(employee_id, attendance_date.date())
         db.session.commit()
+        presence.discard(attendance_id)
+        attendance_changes.notify()
         
         return jsonify({"message": "Attendance berhasil dihapus"}), 200
         
@@ -588,32 +870,10 @@ def get_all_attendance_today():
     GET /api/attendance/today
     """
     try:
-        today_date = datetime.now().date()
-        
-        attendances = (
-            db.session.query(
-                Attendance.id,
-                Attendance.employee_id,
-                Employee.name.label('employee_name'),
-                Attendance.date,
-                Attendance.created_at
-            )
-            .join(Employee, Attendance.employee_id == Employee.id)
-            .filter(db.func.date(Attendance.date) == today_date)
-            .order_by(Attendance.created_at.desc())
-            .all()
-        )
+        # Jawab dari presence set, tanpa query ke tabel attendance
+        today_date, attendances = presence.snapshot()
         
-        result = [
-            {
-                "attendance_id": att.id,
-                "employee_id": att.employee_id,
-                "employee_name": att.employee_name,
-                "date": att.date.strftime("%Y-%m-%d"),
-                "time": att.created_at.strftime("%H:%M:%S")
-            }
-            for att in attendances
-        ]
+        result = serialize_rows(presence_row, attendances)
         
         return jsonify({
             "date": today_date.strftime("%Y-%m-%d"),
@@ -622,4 +882,73 @@ def get_all_attendance_today():
         }), 200
         
     except Exception as e:
-        return jsonify({"message": "Internal server error", "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"message": "Internal server error", "error": str(e)}), 500
+
+
+def stream_attendance_today():
+    """
+    Live feed absensi hari ini via Server-Sent Events (untuk admin/monitoring)
+    GET /api/attendance/today/stream
+
+    Mengirim event "snapshot" sekali di awal, lalu satu event "scan" / "delete"
+    per absensi yang di-commit. Data diambil dari presence set yang sama dengan
+    /api/attendance/today, jadi banyak dashboard tidak menambah query database.
+    Scan yang masuk lewat worker lain ikut terkirim setelah presence set dimuat
+    ulang (PRESENCE_CACHE_TTL), dicek setiap heartbeat.
+    """
+    heartbeat = current_app.config["SSE_HEARTBEAT_SECONDS"]
+
+    def snapshot():
+        today_date, attendances = presence.snapshot()
+        # Jangan tahan koneksi database selama stream terbuka
+        db.session.close()
+        return today_date, attendances
+
+    def generate():
+        today_date, attendances = snapshot()
+        sent = {att.attendance_id: att for att in attendances}
+        yield sse_event("snapshot", {
+            "date": today_date.strftime("%Y-%m-%d"),
+            "total_attendance": len(attendances),
+            "data": [presence_row(att) for att in attendances]
+        })
+
+        version = attendance_changes.version
+        while True:
+            version = attendance_changes.wait(version, heartbeat)
+            current_date, attendances = snapshot()
+
+            # Ganti hari: kirim snapshot baru
+            if current_date != today_date:
+                today_date = current_date
+                sent = {att.attendance_id: att for att in attendances}
+                yield sse_event("snapshot", {
+                    "date": today_date.strftime("%Y-%m-%d"),
+                    "total_attendance": len(attendances),
+                    "data": [presence_row(att) for att in attendances]
+                })
+                continue
+
+            current = {att.attendance_id: att for att in attendances}
+            changed = False
+
+            for attendance_id in sent.keys() - current.keys():
+                changed = True
+                yield sse_event("delete", {
+                    "attendance_id": attendance_id,
+                    "employee_id": sent[attendance_id].employee_id
+                })
+
+            for att in sorted((current[i] for i in current.keys() - sent.keys()), key=lambda a: a.scanned_at):
+                changed = True
+                yield sse_event("scan", presence_row(att))
+
+            if not changed:
+                yield ": keepalive\n\n"
+            sent = current
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -5,5 +5,6 @@ db = SQLAlchemy()
 
 from .admin import Admin
 from .employee import Employee
-from .attendance import Attendance
+from .attendance import Attendance, AttendanceMonthlySummary
 from .schedules import EmployeeSchedule, WorkSchedule, DailySchedule
+from .revoked_token import RevokedToken
@@ -2,9 +2,39 @@ from . import db
 
 class Attendance(db.Model):
     __tablename__ = 'attendance'
+    __table_args__ = (
+        db.Index('ix_attendance_employee_id_date', 'employee_id', 'date'),
+        db.Index('ix_attendance_date_employee_id', 'date', 'employee_id'),
+        db.UniqueConstraint('employee_id', 'attendance_day', name='uq_attendance_employee_id_attendance_day'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id', ondelete='CASCADE'), nullable=False)
     date = db.Column(db.DateTime, server_default=db.func.now())
+    # Tanggal absensi (stored generated column), satu absensi per karyawan per hari
+    attendance_day = db.Column(db.Date, db.Computed('DATE(`date`)', persisted=True))
+    # Status ketepatan waktu saat scan: 'tepat_waktu' / 'terlambat'
+    status = db.Column(db.Enum('tepat_waktu', 'terlambat'))
+    # Menit terlambat dari jam mulai shift (0 jika tepat waktu)
+    minutes_late = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+
+class AttendanceMonthlySummary(db.Model):
+    __tablename__ = 'attendance_monthly_summary'
+    __table_args__ = (
+        db.UniqueConstraint('employee_id', 'month', name='uq_attendance_monthly_summary_employee_id_month'),
+        db.Index('ix_attendance_monthly_summary_month', 'month'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id', ondelete='CASCADE'), nullable=False)
+    # Tanggal 1 dari bulan yang diringkas
+    month = db.Column(db.Date, nullable=False)
+    days_present = db.Column(db.Integer, nullable=False, default=0)
+    days_late = db.Column(db.Integer, nullable=False, default=0)
+    first_scan = db.Column(db.DateTime)
+    last_scan = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
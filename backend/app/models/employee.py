@@ -1,28 +1,38 @@
 from . import db
 from flask_jwt_extended import create_access_token
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from ..utils.password import hash_password
 
 class Employee(db.Model):
     __tablename__ = 'employee'
 
     id = db.Column(db.Integer, primary_key=True)
     nik = db.Column(db.String(20), nullable=False, unique=True)
-    name = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False, index=True)
     gender = db.Column(db.Enum('Male', 'Female', 'Other'), nullable=False)
-    position = db.Column(db.String(100), nullable=False)
+    position = db.Column(db.String(100), nullable=False, index=True)
     email = db.Column(db.String(255), nullable=False, unique=True)
     password = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), index=True)
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+    # Soft delete: terisi saat karyawan dihapus, baris dihapus permanen oleh `flask purge-deleted-employees`
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)
 
-    attendances = db.relationship('Attendance', backref='employee', cascade='all, delete-orphan')
-    employee_schedules = db.relationship('EmployeeSchedule', backref='employee', cascade='all, delete-orphan')
+    # Baris anak dihapus oleh ON DELETE CASCADE di database, tidak dimuat ke session
+    attendances = db.relationship('Attendance', backref='employee', cascade='all, delete-orphan', passive_deletes=True)
+    employee_schedules = db.relationship('EmployeeSchedule', backref='employee', cascade='all, delete-orphan', passive_deletes=True)
+    monthly_summaries = db.relationship('AttendanceMonthlySummary', backref='employee', cascade='all, delete-orphan', passive_deletes=True)
+
+    @classmethod
+    def not_deleted(cls):
+        """Filter karyawan yang belum di-soft-delete."""
+        return cls.deleted_at.is_(None)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return check_password_hash(self.password, password)
 
     def generate_auth_token(self):
         return create_access_token(identity={'id': self.id, 'role': 'employee'})
\ No newline at end of file
@@ -2,6 +2,9 @@ from . import db
 
 class WorkSchedule(db.Model):
     __tablename__ = 'work_schedules'
+    __table_args__ = (
+        db.UniqueConstraint('name', name='uq_work_schedules_name'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
@@ -27,9 +30,14 @@ class DailySchedule(db.Model):
 
 class EmployeeSchedule(db.Model):
     __tablename__ = 'employee_schedules'
+    __table_args__ = (
+        db.UniqueConstraint('employee_id', 'work_schedules_id', 'daily_schedules_id', name='uq_employee_schedules_employee_work_daily'),
+        # Hitung karyawan per work schedule (GROUP BY work_schedules_id) langsung dari index
+        db.Index('ix_employee_schedules_work_schedules_id_employee_id', 'work_schedules_id', 'employee_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id', ondelete='CASCADE'), nullable=False)
     work_schedules_id = db.Column(db.Integer, db.ForeignKey('work_schedules.id'), nullable=False)
     daily_schedules_id = db.Column(db.Integer, db.ForeignKey('daily_schedules.id'), nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
@@ -1,5 +1,5 @@
 from flask import Blueprint
-from .controllers.admin import get_all_employees, get_employee_by_id, create_employee, update_employee, delete_employee, get_all_work_schedules, get_work_schedule_by_id, get_all_attendance, get_attendance_by_id, get_available_schedules_for_employee, add_employee_schedule, update_employee_schedule, delete_employee_schedule, get_all_work_schedulesOP, get_work_schedule_by_idOP, create_work_scheduleOP, update_work_scheduleOP, delete_work_scheduleOP, admin_login
+from .controllers.admin import get_all_employees, get_employee_by_id, create_employee, update_employee, delete_employee, get_all_work_schedules, get_work_schedule_by_id, get_all_attendance, get_attendance_by_id, get_available_schedules_for_employee, add_employee_schedule, update_employee_schedule, delete_employee_schedule, get_all_work_schedulesOP, get_work_schedule_by_idOP, create_work_scheduleOP, update_work_scheduleOP, delete_work_scheduleOP, admin_login, get_cache_stats, export_attendance, get_attendance_monthly_summary, get_lateness_report, get_current_qr_code, bulk_create_employees, bulk_assign_employee_schedules, copy_employee_schedules, get_today_dashboard
 admin_bp = Blueprint('admin', __name__)
 employee_bp = Blueprint('employee', __name__)
 
@@ -9,15 +9,21 @@ admin_bp.route('/login', methods=['POST'])(admin_login)
 admin_bp.route('/employees/<int:id_employee>', methods=['GET'])(get_employee_by_id)
 admin_bp.route('/employees/available-schedules/<int:id_employee>', methods=['GET'])(get_available_schedules_for_employee)
 admin_bp.route('/employees/<int:id_employee>/schedules', methods=['POST'])(add_employee_schedule)
+admin_bp.route('/employees/<int:id_employee>/schedules/copy', methods=['POST'])(copy_employee_schedules)
+admin_bp.route('/employee-schedules/bulk', methods=['POST'])(bulk_assign_employee_schedules)
 admin_bp.route('/employees/<int:id_employee>/schedules/<int:id_employee_schedule>', methods=['PUT'])(update_employee_schedule)
 admin_bp.route('/employees/<int:id_employee>/schedules/<int:id_employee_schedule>', methods=['DELETE'])(delete_employee_schedule)
 admin_bp.route('/employees', methods=['POST'])(create_employee)
+admin_bp.route('/employees/bulk', methods=['POST'])(bulk_create_employees)
 admin_bp.route('/employees/<int:id_employee>', methods=['PUT'])(update_employee)
 admin_bp.route('/employees/<int:id_employee>', methods=['DELETE'])(delete_employee)
 
 admin_bp.route('/work-schedules', methods=['GET'])(get_all_work_schedules)
 admin_bp.route('/work-schedules/<int:id_schedule>', methods=['GET'])(get_work_schedule_by_id)
 admin_bp.route('/attendance', methods=['GET'])(get_all_attendance)
+admin_bp.route('/attendance/export', methods=['GET'])(export_attendance)
+admin_bp.route('/attendance/summary', methods=['GET'])(get_attendance_monthly_summary)
+admin_bp.route('/reports/lateness', methods=['GET'])(get_lateness_report)
 admin_bp.route('/attendance/<int:attendance_id>', methods=['GET'])(get_attendance_by_id)
 
 
@@ -27,11 +33,15 @@ admin_bp.route('/work-schedulesOP', methods=['POST'])(create_work_scheduleOP)
 admin_bp.route('/work-schedulesOP/<int:id_schedule>', methods=['PUT'])(update_work_scheduleOP)
 admin_bp.route('/work-schedulesOP/<int:id_schedule>', methods=['DELETE'])(delete_work_scheduleOP)
 
+admin_bp.route('/cache-stats', methods=['GET'])(get_cache_stats)
+admin_bp.route('/dashboard/today', methods=['GET'])(get_today_dashboard)
+admin_bp.route('/qr/current', methods=['GET'])(get_current_qr_code)
 
 
 
 
-from .controllers.employee import get_employee_today_status, get_employee_schedules, get_attendance_history, get_employee_detail, login, register, verify_token, change_password, scan_qr_attendance, get_attendance_detail, delete_attendance, get_all_attendance_today
+
+from .controllers.employee import get_employee_today_status, get_employee_schedules, get_attendance_history, get_employee_detail, login, register, verify_token, refresh_access_token, logout, change_password, scan_qr_attendance, scan_qr_attendance_batch, get_attendance_detail, delete_attendance, get_all_attendance_today, stream_attendance_today
 
 employee_bp.route('/home/today-status/<int:id_employee>', methods=['GET'])(get_employee_today_status)
 employee_bp.route('/schedules/<int:employee_id>', methods=['GET'])(get_employee_schedules)
@@ -48,6 +58,8 @@ attendance_bp = Blueprint('attendance', __name__, url_prefix='/api/attendance')
 auth_bp.route('/login', methods=['POST'])(login)
 auth_bp.route('/register', methods=['POST'])(register)
 auth_bp.route('/verify', methods=['GET'])(verify_token)
+auth_bp.route('/refresh', methods=['POST'])(refresh_access_token)
+auth_bp.route('/logout', methods=['POST'])(logout)
 auth_bp.route('/change-password', methods=['POST'])(change_password)
 
 # # =====================
@@ -81,6 +93,11 @@ attendance_bp.route('/scan', methods=['POST'])(
     scan_qr_attendance
 )
 
+# Batch scan (replay kiosk offline / antrian retry mobile)
+attendance_bp.route('/scan/batch', methods=['POST'])(
+    scan_qr_attendance_batch
+)
+
 # Get attendance detail
 attendance_bp.route('/<int:attendance_id>', methods=['GET'])(
     get_attendance_detail
@@ -94,4 +111,9 @@ attendance_bp.route('/<int:attendance_id>', methods=['DELETE'])(
 # Get all attendance today (monitoring)
 attendance_bp.route('/today', methods=['GET'])(
     get_all_attendance_today
-)
\ No newline at end of file
+)
+
+# Live feed absensi hari ini (Server-Sent Events)
+attendance_bp.route('/today/stream', methods=['GET'])(
+    stream_attendance_today
+)
@@ -0,0 +1,145 @@
+import csv
+import io
+import zlib
+
+from ..models import db, Attendance
+from .attendance_query import filtered_attendance_query
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "csv.gz": ("application/gzip", "csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+EXPORT_COLUMNS = ["attendance_id", "employee_id", "employee_name", "position", "attendance_date"]
+
+
+def iter_attendance_chunks(filters, chunk_size):
+    """
+    Stream baris export dari database memakai server-side cursor,
+    dikembalikan per chunk berisi maksimal chunk_size baris.
+    """
+    query = (
+        filtered_attendance_query(**filters)
+        .order_by(Attendance.date.asc(), Attendance.id.asc())
+    )
+    result = db.session.execute(
+        query.statement,
+        execution_options={"stream_results": True, "yield_per": chunk_size}
+    )
+    try:
+        for partition in result.partitions(chunk_size):
+            yield partition
+    finally:
+        result.close()
+
+
+def _csv_bytes(rows, header=False):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for r in rows:
+        writer.writerow([
+            r.attendance_id,
+            r.employee_id,
+            r.employee_name,
+            r.position,
+            r.attendance_date.strftime("%Y-%m-%d %H:%M:%S") if r.attendance_date else ""
+        ])
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_csv(chunks, compress=False):
+    """
+    Ubah chunk baris menjadi potongan bytes CSV (opsional gzip) satu per chunk.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+
+    data = _csv_bytes([], header=True)
+    yield compressor.compress(data) if compressor else data
+
+    for rows in chunks:
+        data = _csv_bytes(rows)
+        yield compressor.compress(data) if compressor else data
+
+    if compressor:
+        yield compressor.flush()
+
+
+class _DrainableSink(io.RawIOBase):
+    """
+    File-like tujuan ParquetWriter yang isinya diambil setelah setiap row group.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_parquet(chunks):
+    """
+    Ubah chunk baris menjadi potongan bytes Parquet, satu row group per chunk.
+    Membutuhkan pyarrow (terdaftar di requirements.txt).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+    return _parquet_parts(chunks, pa, pq)
+
+
+def _parquet_parts(chunks, pa, pq):
+    schema = pa.schema([
+        ("attendance_id", pa.int64()),
+        ("employee_id", pa.int64()),
+        ("employee_name", pa.string()),
+        ("position", pa.string()),
+        ("attendance_date", pa.timestamp("s")),
+    ])
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for rows in chunks:
+            columns = list(zip(*rows)) if rows else [[] for _ in EXPORT_COLUMNS]
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def encode_chunks(export_format, chunks):
+    """
+    Generator bytes untuk format export yang diminta ("csv", "csv.gz", "parquet").
+    """
+    if export_format == "parquet":
+        return stream_parquet(chunks)
+    return stream_csv(chunks, compress=export_format == "csv.gz")
+
+
+def stream_export(export_format, filters, chunk_size):
+    return encode_chunks(export_format, iter_attendance_chunks(filters, chunk_size))
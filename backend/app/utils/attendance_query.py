@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from ..models import db, Attendance, Employee
+from .date_helper import day_range
+
+
+def filtered_attendance_query(date_from=None, date_to=None, employee_id=None, position=None):
+    """
+    Query join Attendance-Employee yang dipakai listing admin dan export.
+    date_from/date_to inklusif per hari, diterapkan sebagai rentang setengah terbuka.
+    """
+    query = (
+        db.session.query(
+            Attendance.id.label("attendance_id"),
+            Employee.id.label("employee_id"),
+            Employee.name.label("employee_name"),
+            Employee.position.label("position"),
+            Attendance.date.label("attendance_date")
+        )
+        .join(Employee, Employee.id == Attendance.employee_id)
+    )
+
+    if date_from:
+        query = query.filter(Attendance.date >= day_range(date_from)[0])
+    if date_to:
+        query = query.filter(Attendance.date < day_range(date_to)[1])
+    if employee_id:
+        query = query.filter(Attendance.employee_id == employee_id)
+    if position:
+        query = query.filter(Employee.position == position)
+
+    return query
+
+
+def parse_attendance_filters(args):
+    """
+    Ambil filter listing/export dari query string, raise ValueError jika formatnya salah.
+    """
+    date_from = args.get("date_from")
+    date_to = args.get("date_to")
+    employee_id = args.get("employee_id")
+
+    return {
+        "date_from": datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None,
+        "date_to": datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else None,
+        "employee_id": int(employee_id) if employee_id else None,
+        "position": args.get("position") or None
+    }
@@ -0,0 +1,193 @@
+from sqlalchemy import case, delete, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from ..models import db, Attendance, AttendanceMonthlySummary
+from .date_helper import month_range
+from .roster_cache import roster_cache, punctuality_status
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _apply_scans(employee_id, month, present, late, first_scan, last_scan):
+    """
+    Tambahkan `present` absensi (`late` di antaranya terlambat) ke ringkasan satu
+    karyawan/bulan: UPDATE increment dulu, INSERT baris baru (savepoint) jika
+    belum ada, dan ulangi UPDATE jika request lain baru saja membuatnya.
+    """
+    S = AttendanceMonthlySummary
+
+    increment = (
+        update(S)
+        .where(S.employee_id == employee_id, S.month == month)
+        .values(
+            days_present=S.days_present + present,
+            days_late=S.days_late + late,
+            first_scan=case(
+                ((S.first_scan.is_(None)) | (S.first_scan > first_scan), first_scan),
+                else_=S.first_scan
+            ),
+            last_scan=case(
+                ((S.last_scan.is_(None)) | (S.last_scan < last_scan), last_scan),
+                else_=S.last_scan
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if db.session.execute(increment).rowcount:
+        return
+
+    # Absensi pertama bulan ini: buat baris ringkasan baru
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(S).values(
+                employee_id=employee_id,
+                month=month,
+                days_present=present,
+                days_late=late,
+                first_scan=first_scan,
+                last_scan=last_scan
+            ))
+    except IntegrityError:
+        # Request lain baru saja membuat barisnya
+        db.session.execute(increment)
+
+
+def record_scan(employee_id, scanned_at, is_late):
+    """
+    Tambahkan satu absensi ke ringkasan bulanan karyawan secara incremental.
+    Dipanggil sebelum commit supaya ikut dalam transaksi yang sama dengan INSERT absensi.
+    """
+    _apply_scans(employee_id, month_start(scanned_at.date()), 1, 1 if is_late else 0, scanned_at, scanned_at)
+
+
+def record_scans(scans):
+    """
+    Versi batch record_scan: scans berisi (employee_id, scanned_at, is_late),
+    digabung per karyawan/bulan sehingga cukup satu UPDATE (atau INSERT) per grup.
+    """
+    totals = {}
+    for employee_id, scanned_at, is_late in scans:
+        key = (employee_id, month_start(scanned_at.date()))
+        total = totals.setdefault(key, [0, 0, scanned_at, scanned_at])
+        total[0] += 1
+        total[1] += 1 if is_late else 0
+        total[2] = min(total[2], scanned_at)
+        total[3] = max(total[3], scanned_at)
+    for (employee_id, month), (present, late, first_scan, last_scan) in totals.items():
+        _apply_scans(employee_id, month, present, late, first_scan, last_scan)
+
+
+def refresh_summary(employee_id, day):
+    """
+    Hitung ulang ringkasan satu karyawan untuk bulan `day` (mis. setelah absensi
+    dihapus) dan tulis dengan UPDATE lalu INSERT jika belum ada, tanpa DELETE +
+    INSERT yang bisa bentrok dengan record_scan yang berjalan bersamaan. Baris
+    ringkasan dihapus jika tidak ada absensi tersisa di bulan tersebut.
+    """
+    S = AttendanceMonthlySummary
+    month = month_start(day)
+    range_start, range_end = month_range(month)
+
+    rows = (
+        db.session.query(Attendance.date, Attendance.status)
+        .filter(
+            Attendance.employee_id == employee_id,
+            Attendance.date >= range_start,
+            Attendance.date < range_end
+        )
+        .all()
+    )
+    dates = [r.date for r in rows if r.date is not None]
+    target = (S.employee_id == employee_id) & (S.month == month)
+
+    if not dates:
+        db.session.execute(delete(S).where(target).execution_options(synchronize_session=False))
+        return
+
+    roster = roster_cache.snapshot()
+    late = 0
+    for r in rows:
+        status = r.status
+        if status is None and r.date is not None:
+            # Absensi lama sebelum status disimpan saat scan
+            schedule = roster.get((employee_id, r.date.weekday()))
+            status = punctuality_status(schedule, r.date) if schedule else None
+        if status == "terlambat":
+            late += 1
+    values = {
+        "days_present": len(dates),
+        "days_late": late,
+        "first_scan": min(dates),
+        "last_scan": max(dates)
+    }
+
+    overwrite = update(S).where(target).values(**values).execution_options(synchronize_session=False)
+    if db.session.execute(overwrite).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(S).values(employee_id=employee_id, month=month, **values))
+    except IntegrityError:
+        # Request lain baru saja membuat barisnya
+        db.session.execute(overwrite)
+
+
+def rebuild_summaries(month_from, month_to, employee_ids=None, chunk_size=5000):
+    """
+    Hitung ulang ringkasan untuk rentang bulan [month_from, month_to] dari data absensi mentah.
+    Status terlambat diambil dari Attendance.status; untuk absensi lama yang belum
+    punya status, dihitung dari jadwal karyawan saat ini (roster cache).
+    Mengembalikan jumlah baris ringkasan yang ditulis; commit dilakukan oleh pemanggil.
+    """
+    S = AttendanceMonthlySummary
+    range_start = month_range(month_from)[0]
+    range_end = month_range(month_to)[1]
+
+    clear = delete(S).where(S.month >= range_start.date(), S.month < range_end.date())
+    rows = (
+        db.session.query(Attendance.employee_id, Attendance.date, Attendance.status)
+        .filter(Attendance.date >= range_start, Attendance.date < range_end)
+    )
+    if employee_ids is not None:
+        clear = clear.where(S.employee_id.in_(employee_ids))
+        rows = rows.filter(Attendance.employee_id.in_(employee_ids))
+
+    db.session.execute(clear.execution_options(synchronize_session=False))
+
+    # Agregasi per (employee_id, bulan): [hadir, terlambat, scan pertama, scan terakhir]
+    roster = roster_cache.snapshot()
+    totals = {}
+    for r in rows.yield_per(chunk_size):
+        if r.date is None:
+            continue
+        key = (r.employee_id, month_start(r.date.date()))
+        total = totals.setdefault(key, [0, 0, r.date, r.date])
+        total[0] += 1
+        status = r.status
+        if status is None:
+            # Absensi lama sebelum status disimpan saat scan
+            schedule = roster.get((r.employee_id, r.date.weekday()))
+            status = punctuality_status(schedule, r.date) if schedule else None
+        if status == "terlambat":
+            total[1] += 1
+        total[2] = min(total[2], r.date)
+        total[3] = max(total[3], r.date)
+
+    values = [
+        {
+            "employee_id": employee_id,
+            "month": month,
+            "days_present": present,
+            "days_late": late,
+            "first_scan": first_scan,
+            "last_scan": last_scan
+        }
+        for (employee_id, month), (present, late, first_scan, last_scan) in totals.items()
+    ]
+    for i in range(0, len(values), chunk_size):
+        db.session.execute(insert(S), values[i:i + chunk_size])
+
+    return len(values)
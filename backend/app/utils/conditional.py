@@ -0,0 +1,98 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..models import db, EmployeeSchedule, WorkSchedule, DailySchedule
+
+
+def last_updated(model, *criteria, joins=()):
+    """
+    Scalar subquery max(model.updated_at) untuk baris yang memenuhi criteria.
+    joins: pasangan (model, onclause) untuk filter lewat tabel relasi.
+    """
+    stmt = select(func.max(model.updated_at))
+    for target, onclause in joins:
+        stmt = stmt.join(target, onclause)
+    return stmt.where(*criteria).scalar_subquery()
+
+
+def row_count(model, *criteria):
+    """Scalar subquery count(*) untuk baris model yang memenuhi criteria."""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def employee_schedules_validator(employee_id):
+    """
+    Validator jadwal seorang karyawan: baris employee_schedules beserta
+    work/daily schedule yang direferensikan (jam shift bisa berubah).
+    """
+    return [
+        last_updated(EmployeeSchedule, EmployeeSchedule.employee_id == employee_id),
+        row_count(EmployeeSchedule, EmployeeSchedule.employee_id == employee_id),
+        last_updated(
+            WorkSchedule, EmployeeSchedule.employee_id == employee_id,
+            joins=[(EmployeeSchedule, EmployeeSchedule.work_schedules_id == WorkSchedule.id)]
+        ),
+        last_updated(
+            DailySchedule, EmployeeSchedule.employee_id == employee_id,
+            joins=[(EmployeeSchedule, EmployeeSchedule.daily_schedules_id == DailySchedule.id)]
+        )
+    ]
+
+
+def conditional(validator):
+    """
+    Decorator conditional GET untuk endpoint baca.
+
+    validator(**view_args) mengembalikan list scalar subquery (last_updated /
+    row_count) yang dijalankan sebagai satu SELECT ringan. Hasilnya menjadi ETag
+    dan max(updated_at) menjadi Last-Modified. Jika If-None-Match cocok (atau,
+    tanpa If-None-Match, If-Modified-Since tidak lebih lama) response 304 dikirim
+    tanpa menjalankan query utama dan serialisasi.
+
+    Penghapusan baris hanya terdeteksi lewat row_count di ETag, jadi klien yang
+    hanya mengirim If-Modified-Since bisa tidak melihat baris yang dihapus.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                values = db.session.execute(select(*validator(**kwargs))).one()
+            except SQLAlchemyError:
+                # Validator gagal: layani response penuh, error ditangani view
+                db.session.rollback()
+                return view(*args, **kwargs)
+
+            digest = hashlib.sha1(
+                f"{request.endpoint}|{sorted(kwargs.items())}|{request.query_string.decode()}|{tuple(values)}".encode()
+            ).hexdigest()
+            timestamps = [v for v in values if hasattr(v, "timestamp")]
+            last_modified = max(timestamps).replace(microsecond=0).astimezone(timezone.utc) if timestamps else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(digest)
+            else:
+                not_modified = bool(
+                    last_modified and request.if_modified_since
+                    and last_modified <= request.if_modified_since
+                )
+
+            if not_modified:
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(digest, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Klien selalu revalidasi, tapi boleh memakai salinan lokal jika 304
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
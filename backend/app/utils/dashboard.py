@@ -0,0 +1,139 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import case
+
+from ..models import db, Attendance, DailySchedule, Employee, EmployeeSchedule, WorkSchedule
+from .date_helper import HARI, day_range
+from .serializers import iso_datetime, iso_minutes
+
+
+def today_shift_counts(now):
+    """
+    Satu SELECT agregat per shift hari ini: jadwal karyawan (employee_schedules
+    + daily/work schedule) LEFT JOIN absensi hari ini, GROUP BY work schedule.
+    Karyawan yang sudah di-soft-delete tidak dihitung.
+    """
+    day_start, day_end = day_range(now.date())
+    on_time = case((Attendance.status == "tepat_waktu", Attendance.employee_id))
+    late = case((Attendance.status == "terlambat", Attendance.employee_id))
+
+    return (
+        db.session.query(
+            WorkSchedule.id.label("work_schedule_id"),
+            WorkSchedule.name.label("shift_name"),
+            WorkSchedule.start_time.label("start_time"),
+            WorkSchedule.end_time.label("end_time"),
+            WorkSchedule.tolerance_minutes.label("tolerance_minutes"),
+            db.func.count(EmployeeSchedule.employee_id.distinct()).label("scheduled"),
+            db.func.count(Attendance.employee_id.distinct()).label("present"),
+            db.func.count(on_time.distinct()).label("on_time"),
+            db.func.count(late.distinct()).label("late")
+        )
+        .select_from(EmployeeSchedule)
+        .join(DailySchedule, DailySchedule.id == EmployeeSchedule.daily_schedules_id)
+        .join(WorkSchedule, WorkSchedule.id == EmployeeSchedule.work_schedules_id)
+        .join(Employee, Employee.id == EmployeeSchedule.employee_id)
+        .outerjoin(
+            Attendance,
+            (Attendance.employee_id == EmployeeSchedule.employee_id)
+            & (Attendance.date >= day_start) & (Attendance.date < day_end)
+        )
+        .filter(DailySchedule.name == HARI[now.weekday()], Employee.not_deleted())
+        .group_by(WorkSchedule.id)
+        .order_by(WorkSchedule.start_time.asc(), WorkSchedule.id.asc())
+        .all()
+    )
+
+
+def build_today_dashboard(now=None):
+    """
+    Ringkasan absensi hari ini untuk dashboard admin. absent_so_far hanya
+    menghitung shift yang batas toleransinya (start_time + tolerance) sudah lewat.
+    Total adalah jumlah per shift, sehingga karyawan dengan dua shift di hari
+    yang sama terhitung di keduanya.
+    """
+    now = now or datetime.now()
+    shifts = []
+    totals = dict.fromkeys(("scheduled", "present", "on_time", "late", "absent_so_far"), 0)
+
+    for row in today_shift_counts(now):
+        deadline = (
+            datetime.combine(now.date(), row.start_time)
+            + timedelta(minutes=row.tolerance_minutes or 0)
+        )
+        counts = {
+            "scheduled": row.scheduled,
+            "present": row.present,
+            "on_time": row.on_time,
+            "late": row.late,
+            "absent_so_far": row.scheduled - row.present if now > deadline else 0
+        }
+        for key, value in counts.items():
+            totals[key] += value
+        shifts.append({
+            "work_schedule_id": row.work_schedule_id,
+            "shift_name": row.shift_name,
+            "start_time": iso_minutes(row.start_time),
+            "end_time": iso_minutes(row.end_time),
+            "tolerance_minutes": row.tolerance_minutes,
+            **counts
+        })
+
+    return {
+        "date": now.date().isoformat(),
+        "day_name": HARI[now.weekday()],
+        "generated_at": iso_datetime(now),
+        **totals,
+        "shifts": shifts
+    }
+
+
+class DashboardCache:
+    """
+    Cache singkat (DASHBOARD_CACHE_SECONDS) untuk payload dashboard hari ini
+    yang sudah diserialisasi. Perhitungan ulang dilakukan di bawah lock, jadi
+    request yang datang bersamaan saat cache kadaluarsa menunggu dan memakai
+    hasil yang sama, bukan menjalankan query masing-masing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._day = None
+        self._payload = None
+        self._loaded_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, today):
+        ttl = current_app.config.get("DASHBOARD_CACHE_SECONDS", 5)
+        return (
+            self._day != today
+            or self._loaded_at is None
+            or time.monotonic() - self._loaded_at > ttl
+        )
+
+    def get(self):
+        """Return payload JSON (bytes) dashboard hari ini."""
+        with self._lock:
+            now = datetime.now()
+            if self._expired(now.date()):
+                self.misses += 1
+                self._payload = current_app.json.dumps(build_today_dashboard(now)).encode()
+                self._day = now.date()
+                self._loaded_at = time.monotonic()
+            else:
+                self.hits += 1
+            return self._payload
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "day": self._day.isoformat() if self._day else None
+        }
+
+
+dashboard_cache = DashboardCache()
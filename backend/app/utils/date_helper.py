@@ -0,0 +1,35 @@
+from datetime import date, datetime, time, timedelta
+
+
+# Nama hari dalam bahasa Indonesia, index sesuai datetime.weekday() (0 = Senin)
+HARI = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+
+def day_range(day: date):
+    """
+    Rentang setengah terbuka [00:00 hari ini, 00:00 besok) untuk satu hari.
+    Dipakai sebagai pengganti db.func.date(kolom) == tanggal supaya index
+    pada kolom datetime tetap bisa dipakai oleh MySQL.
+    """
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def week_range(day: date):
+    """
+    Rentang setengah terbuka minggu berjalan (Senin 00:00 - Senin berikutnya 00:00).
+    """
+    start = datetime.combine(day - timedelta(days=day.weekday()), time.min)
+    return start, start + timedelta(days=7)
+
+
+def month_range(day: date):
+    """
+    Rentang setengah terbuka bulan berjalan (tanggal 1 - tanggal 1 bulan berikutnya).
+    """
+    start = datetime(day.year, day.month, 1)
+    if day.month == 12:
+        end = datetime(day.year + 1, 1, 1)
+    else:
+        end = datetime(day.year, day.month + 1, 1)
+    return start, end
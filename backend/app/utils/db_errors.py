@@ -0,0 +1,37 @@
+import re
+
+from sqlalchemy.exc import IntegrityError
+
+
+# Kode error MySQL untuk pelanggaran unique key
+MYSQL_DUPLICATE_ENTRY = 1062
+
+
+def is_duplicate_key(error: IntegrityError):
+    """
+    True jika IntegrityError disebabkan unique constraint (bukan foreign key / not null).
+    """
+    orig = getattr(error, "orig", None)
+    args = getattr(orig, "args", ())
+    if args and args[0] == MYSQL_DUPLICATE_ENTRY:
+        return True
+    # Fallback untuk driver lain (mis. SQLite saat development)
+    return "UNIQUE constraint failed" in str(orig)
+
+
+def duplicate_key_name(error: IntegrityError):
+    """
+    Nama unique key yang dilanggar (huruf kecil), mis. "email" / "nik" /
+    "uq_work_schedules_name"; untuk SQLite berisi daftar kolomnya.
+    String kosong jika tidak bisa ditentukan.
+    """
+    message = str(getattr(error, "orig", error))
+    # MySQL: Duplicate entry 'x' for key 'employee.email' (5.7: 'email')
+    match = re.search(r"for key '([^']+)'", message)
+    if match:
+        return match.group(1).rsplit(".", 1)[-1].lower()
+    # SQLite: UNIQUE constraint failed: employee.email
+    match = re.search(r"UNIQUE constraint failed: (.+)", message)
+    if match:
+        return match.group(1).lower()
+    return ""
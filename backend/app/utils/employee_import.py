@@ -0,0 +1,161 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash
+
+from ..models import db, Employee
+from .db_errors import is_duplicate_key
+from .password import password_hash_method
+
+EMPLOYEE_FIELDS = ("nik", "name", "gender", "position", "email", "password")
+
+
+def _validate(index, row, seen_niks, seen_emails):
+    """
+    Normalisasi satu baris input. Return (result, clean_row); clean_row None
+    jika baris ditolak (status di result).
+    """
+    result = {"index": index, "nik": None, "email": None}
+    if not isinstance(row, dict):
+        result["status"] = "invalid"
+        result["error"] = "Row must be an object"
+        return result, None
+
+    clean = {field: str(row.get(field) or "").strip() for field in EMPLOYEE_FIELDS}
+    clean["password"] = str(row.get("password") or "")
+    result["nik"] = clean["nik"] or None
+    result["email"] = clean["email"] or None
+
+    missing = [field for field in EMPLOYEE_FIELDS if not clean[field]]
+    if missing:
+        result["status"] = "invalid"
+        result["error"] = f"Missing required fields: {', '.join(missing)}"
+        return result, None
+    if clean["gender"] not in Employee.gender.type.enums:
+        result["status"] = "invalid"
+        result["error"] = "Invalid gender"
+        return result, None
+
+    if clean["nik"] in seen_niks or clean["email"] in seen_emails:
+        result["status"] = "duplicate_in_file"
+        return result, None
+    seen_niks.add(clean["nik"])
+    seen_emails.add(clean["email"])
+    return result, clean
+
+
+def _hash_passwords(passwords):
+    """
+    Hash password di process pool (PBKDF2 terikat CPU dan GIL), satu proses per core
+    atau EMPLOYEE_IMPORT_WORKERS. Hanya untuk CLI: di worker web pool ini akan
+    menghabiskan seluruh core yang dibutuhkan scan dan login.
+    """
+    if not passwords:
+        return []
+    workers = current_app.config["EMPLOYEE_IMPORT_WORKERS"] or os.cpu_count() or 1
+    workers = min(workers, len(passwords))
+    method = password_hash_method()
+    if workers == 1:
+        return [generate_password_hash(password, method) for password in passwords]
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        chunksize = max(len(passwords) // (workers * 4), 1)
+        return list(executor.map(generate_password_hash, passwords, repeat(method), chunksize=chunksize))
+
+
+def _insert_chunk(chunk):
+    """
+    INSERT multi-row satu chunk dalam satu transaksi. Jika bentrok unique dengan
+    insert lain yang masuk bersamaan, chunk diulang per baris dengan savepoint
+    supaya hanya baris yang bentrok yang gagal. Return set NIK yang tersimpan.
+    """
+    try:
+        db.session.execute(insert(Employee), [row for _, row in chunk])
+        db.session.commit()
+        return {row["nik"] for _, row in chunk}
+    except IntegrityError as e:
+        db.session.rollback()
+        if not is_duplicate_key(e):
+            raise
+
+    inserted = set()
+    for result, row in chunk:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(Employee), row)
+            inserted.add(row["nik"])
+        except IntegrityError as e:
+            if not is_duplicate_key(e):
+                raise
+            result["status"] = "duplicate"
+    db.session.commit()
+    return inserted
+
+
+def import_employees(rows, chunk_size=None, hasher=None):
+    """
+    Import banyak karyawan sekaligus:
+    1. validasi + deteksi duplikat di dalam input (tanpa database)
+    2. satu query set-based untuk NIK/email yang sudah terdaftar
+    3. hash password paralel di process pool
+    4. INSERT multi-row per chunk, commit per chunk
+    Return list hasil per baris sesuai urutan input (status: created, invalid,
+    duplicate, duplicate_in_file).
+
+    hasher(passwords) -> list hash dipakai menggantikan process pool di langkah 3,
+    mis. password_verifier.hash_many untuk request HTTP (paralel di executor
+    terbatas; PasswordVerifierBusy diteruskan ke pemanggil sebelum ada INSERT).
+    """
+    chunk_size = chunk_size or current_app.config["EMPLOYEE_IMPORT_CHUNK_SIZE"]
+    seen_niks, seen_emails = set(), set()
+    results = []
+    pending = []
+
+    # 1️⃣ Validasi per baris
+    for index, row in enumerate(rows):
+        result, clean = _validate(index, row, seen_niks, seen_emails)
+        results.append(result)
+        if clean is not None:
+            pending.append((result, clean))
+
+    # 2️⃣ NIK/email yang sudah ada (satu query)
+    if pending:
+        existing = db.session.query(Employee.nik, Employee.email).filter(
+            Employee.nik.in_(seen_niks) | Employee.email.in_(seen_emails)
+        ).all()
+        existing_niks = {row.nik for row in existing}
+        existing_emails = {row.email for row in existing}
+
+        still_pending = []
+        for result, clean in pending:
+            if clean["nik"] in existing_niks or clean["email"] in existing_emails:
+                result["status"] = "duplicate"
+            else:
+                still_pending.append((result, clean))
+        pending = still_pending
+
+    # 3️⃣ Hash password paralel
+    passwords = [clean["password"] for _, clean in pending]
+    hashes = (hasher or _hash_passwords)(passwords)
+    for (_, clean), pwhash in zip(pending, hashes):
+        clean["password"] = pwhash
+
+    # 4️⃣ INSERT multi-row per chunk; id diambil ulang per chunk lewat NIK
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        inserted = _insert_chunk(chunk)
+        ids = dict(
+            db.session.query(Employee.nik, Employee.id).filter(Employee.nik.in_(inserted))
+        ) if inserted else {}
+        for result, clean in chunk:
+            if clean["nik"] in inserted:
+                result["status"] = "created"
+                result["id"] = ids.get(clean["nik"])
+
+    return results
@@ -0,0 +1,45 @@
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from ..models import db, Employee, Attendance, AttendanceMonthlySummary, EmployeeSchedule
+
+
+def purge_deleted_employees(older_than_days=None, batch_size=None, pause_seconds=0):
+    """
+    Hapus permanen karyawan yang sudah di-soft-delete lebih dari older_than_days
+    hari, per batch kecil (satu transaksi per batch) supaya lock dan undo log
+    tetap pendek. Baris anak dihapus eksplisit lebih dulu sehingga batch tetap
+    terbatas walau ON DELETE CASCADE belum aktif (mis. SQLite tanpa foreign_keys).
+    Return jumlah karyawan yang dihapus.
+    """
+    older_than_days = current_app.config["EMPLOYEE_PURGE_AFTER_DAYS"] if older_than_days is None else older_than_days
+    batch_size = batch_size or current_app.config["EMPLOYEE_PURGE_BATCH_SIZE"]
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+
+    purged = 0
+    while True:
+        # MySQL tidak mendukung LIMIT di subquery IN, jadi id diambil dulu
+        ids = [
+            row.id for row in
+            db.session.query(Employee.id)
+            .filter(Employee.deleted_at.isnot(None), Employee.deleted_at <= cutoff)
+            .order_by(Employee.id.asc())
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+
+        for model in (Attendance, AttendanceMonthlySummary, EmployeeSchedule):
+            model.query.filter(model.employee_id.in_(ids)).delete(synchronize_session=False)
+        Employee.query.filter(Employee.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+        purged += len(ids)
+        if len(ids) < batch_size:
+            break
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return purged
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from ..models import db, Employee
+
+
+class IdentityCache:
+    """
+    Cache TTL + LRU untuk identitas employee (id, name, email, position).
+    /api/auth/verify membaca profil dari claim token; cache ini hanya dipakai
+    untuk token lama yang belum membawa claim profil. Saat miss identitas
+    dibaca dari database (karyawan yang di-soft-delete menghasilkan None).
+    update_employee / delete_employee memanggil invalidate().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db_loads = 0
+
+    def _store(self, employee_id, identity):
+        ttl = current_app.config["IDENTITY_CACHE_TTL"]
+        max_size = current_app.config["IDENTITY_CACHE_SIZE"]
+        with self._lock:
+            self._entries[employee_id] = (identity, time.monotonic() + ttl)
+            self._entries.move_to_end(employee_id)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def put(self, employee):
+        """Simpan identitas dari row Employee yang baru saja dibaca (mis. saat login)."""
+        self._store(employee.id, {
+            "id": employee.id,
+            "name": employee.name,
+            "email": employee.email,
+            "position": employee.position
+        })
+
+    def resolve(self, employee_id):
+        """
+        Identitas employee sebagai dict, atau None jika employee sudah tidak ada
+        atau sudah dihapus.
+        """
+        with self._lock:
+            entry = self._entries.get(employee_id)
+            if entry and entry[1] > time.monotonic():
+                self._entries.move_to_end(employee_id)
+                self.hits += 1
+                return entry[0]
+        self.misses += 1
+
+        self.db_loads += 1
+        row = (
+            db.session.query(Employee.id, Employee.name, Employee.email, Employee.position)
+            .filter(Employee.id == employee_id, Employee.not_deleted())
+            .first()
+        )
+        identity = dict(row._mapping) if row else None
+
+        self._store(employee_id, identity)
+        return identity
+
+    def invalidate(self, employee_id):
+        with self._lock:
+            self._entries.pop(employee_id, None)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "db_loads": self.db_loads,
+            "entries": len(self._entries)
+        }
+
+
+identity_cache = IdentityCache()
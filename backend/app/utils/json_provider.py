@@ -0,0 +1,58 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependency opsional, fallback ke provider bawaan Flask
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider berbasis orjson untuk jsonify() dan request.get_json().
+    Tipe yang tidak dikenal orjson (Decimal, UUID, date/datetime, dll.)
+    diserialisasi lewat default() milik Flask sehingga hasilnya sama dengan
+    provider bawaan; sort_keys tetap dihormati.
+    """
+
+    def _option(self):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def _default(self, o):
+        # namedtuple tidak diserialisasi orjson; samakan dengan json bawaan (list)
+        if isinstance(o, tuple):
+            return list(o)
+        return self.default(o)
+
+    def dumps(self, obj, **kwargs):
+        # Argumen json.dumps (indent, sort_keys, dll.) hanya dipenuhi provider bawaan
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self._default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def _pretty(self):
+        """Aturan pretty print Flask: compact=False, atau compact=None dalam debug mode."""
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def response(self, *args, **kwargs):
+        # Pretty print (debug) lewat jalur bawaan Flask, selain itu compact via orjson
+        if self._pretty():
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self._default, option=self._option())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Pasang OrjsonProvider; tanpa orjson (dependency wajib) tetap jalan dengan warning."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.logger.warning("orjson tidak terpasang, JSON memakai provider bawaan Flask (lebih lambat)")
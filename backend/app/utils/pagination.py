@@ -0,0 +1,38 @@
+import base64
+from datetime import datetime
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    Ambil ukuran halaman dari query string, dibatasi 1..maximum.
+    """
+    if value in (None, ""):
+        return default
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, maximum)
+
+
+def encode_cursor(sort_value: datetime, row_id: int):
+    """
+    Cursor keyset opaque untuk pasangan (datetime, id) baris terakhir di halaman.
+    """
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Kebalikan encode_cursor, raise ValueError jika cursor tidak valid.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,158 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, jsonify
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from ..models import db
+
+
+def password_hash_method():
+    """
+    Method hash password sesuai kebijakan di Config, mis. "pbkdf2:sha256:1000000".
+    """
+    return f"{current_app.config['PASSWORD_HASH_METHOD']}:{current_app.config['PASSWORD_HASH_ITERATIONS']}"
+
+
+def hash_password(password):
+    """Hash password baru dengan kebijakan yang berlaku."""
+    return generate_password_hash(password, method=password_hash_method())
+
+
+def needs_rehash(pwhash):
+    """True jika hash tersimpan dibuat dengan method/iterasi yang berbeda dari kebijakan saat ini."""
+    return pwhash.split("$", 1)[0] != password_hash_method()
+
+
+class PasswordVerifierBusy(Exception):
+    """Antrian verifikasi password penuh."""
+
+
+class PasswordVerifier:
+    """
+    Executor terbatas untuk verifikasi dan hash ulang password (PBKDF2).
+    Jumlah hash yang dihitung bersamaan dibatasi PASSWORD_VERIFY_WORKERS dan
+    antrian dibatasi PASSWORD_VERIFY_QUEUE, sehingga badai login saat awal shift
+    tidak menghabiskan CPU yang dibutuhkan request scan. Jika antrian penuh,
+    verify() langsung gagal dengan PasswordVerifierBusy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    workers = current_app.config["PASSWORD_VERIFY_WORKERS"]
+                    queue_depth = current_app.config["PASSWORD_VERIFY_QUEUE"]
+                    self._slots = threading.BoundedSemaphore(workers + queue_depth)
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=workers,
+                        thread_name_prefix="password-verify"
+                    )
+
+    def _run(self, fn, *args):
+        self._ensure_executor()
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordVerifierBusy()
+        try:
+            result = self._executor.submit(fn, *args).result()
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._slots.release()
+        self.completed += 1
+        return result
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, password_hash_method())
+
+    def _result(self, future):
+        try:
+            result = future.result()
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        return result
+
+    def hash_many(self, passwords):
+        """
+        Hash banyak password (import massal). Mengambil paling banyak
+        PASSWORD_VERIFY_WORKERS slot sekaligus dan menjaga sebanyak itu hash
+        berjalan paralel sampai selesai, sehingga sisa antrian tetap tersedia
+        untuk login. PasswordVerifierBusy jika tidak ada slot sama sekali.
+        Return list hash sesuai urutan input.
+        """
+        if not passwords:
+            return []
+        self._ensure_executor()
+        window = min(current_app.config["PASSWORD_VERIFY_WORKERS"], len(passwords))
+        held = 0
+        while held < window and self._slots.acquire(blocking=False):
+            held += 1
+        if not held:
+            self.rejected += 1
+            raise PasswordVerifierBusy()
+
+        method = password_hash_method()
+        futures = deque()
+        results = []
+        try:
+            for password in passwords:
+                if len(futures) >= held:
+                    results.append(self._result(futures.popleft()))
+                futures.append(self._executor.submit(generate_password_hash, password, method))
+            while futures:
+                results.append(self._result(futures.popleft()))
+        finally:
+            for future in futures:
+                future.cancel()
+            for _ in range(held):
+                self._slots.release()
+        return results
+
+    def stats(self):
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+
+def rehash_password(user, password):
+    """
+    Setelah login berhasil, simpan ulang hash password user (Employee/Admin) jika
+    dibuat dengan kebijakan lama. Dilewati bila executor sedang penuh; dicoba lagi
+    pada login berikutnya.
+    """
+    if not needs_rehash(user.password):
+        return
+    try:
+        user.password = password_verifier.hash(password)
+    except PasswordVerifierBusy:
+        return
+    db.session.commit()
+
+
+def busy_response():
+    """Response 503 + Retry-After saat antrian verifikasi password penuh."""
+    retry_after = current_app.config["PASSWORD_VERIFY_RETRY_AFTER"]
+    response = jsonify({"message": "Server sedang sibuk, silakan coba lagi sebentar lagi"})
+    response.headers["Retry-After"] = str(retry_after)
+    return response, 503
+
+
+password_verifier = PasswordVerifier()
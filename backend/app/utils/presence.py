@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import date
+
+from flask import current_app
+
+from ..models import db, Attendance, Employee
+from .date_helper import day_range
+
+
+PresenceEntry = namedtuple("PresenceEntry", ["attendance_id", "employee_id", "employee_name", "scanned_at"])
+
+
+class PresenceSet:
+    """
+    Daftar karyawan yang sudah absen hari ini (beserta waktu scan pertama),
+    dipakai bersama oleh endpoint monitoring dan today-status.
+    Dimuat dari database pada pemakaian pertama, diperbarui setelah scan/hapus
+    absensi di-commit, dan otomatis dimuat ulang saat tanggal berganti.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._day = None
+        self._entries = {}
+        self._loaded_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, today):
+        ttl = current_app.config.get("PRESENCE_CACHE_TTL", 60)
+        return (
+            self._day != today
+            or self._loaded_at is None
+            or (ttl and time.monotonic() - self._loaded_at > ttl)
+        )
+
+    def load(self, day):
+        day_start, day_end = day_range(day)
+        rows = (
+            db.session.query(
+                Attendance.id,
+                Attendance.employee_id,
+                Employee.name.label("employee_name"),
+                Attendance.date
+            )
+            .join(Employee, Attendance.employee_id == Employee.id)
+            .filter(Attendance.date >= day_start, Attendance.date < day_end, Employee.not_deleted())
+            .all()
+        )
+        with self._lock:
+            self._entries = {
+                r.employee_id: PresenceEntry(r.id, r.employee_id, r.employee_name, r.date)
+                for r in rows
+            }
+            self._day = day
+            self._loaded_at = time.monotonic()
+
+    def _ensure(self):
+        today = date.today()
+        if self._expired(today):
+            self.misses += 1
+            self.load(today)
+        else:
+            self.hits += 1
+        return today
+
+    def get(self, employee_id):
+        """Entri absensi hari ini untuk karyawan, None jika belum absen."""
+        self._ensure()
+        return self._entries.get(employee_id)
+
+    def snapshot(self):
+        """(tanggal, daftar entri hari ini urut waktu scan terbaru dulu)."""
+        today = self._ensure()
+        entries = sorted(self._entries.values(), key=lambda e: (e.scanned_at, e.attendance_id), reverse=True)
+        return today, entries
+
+    def add(self, attendance_id, employee_id, employee_name, scanned_at):
+        with self._lock:
+            if self._day == scanned_at.date() and employee_id not in self._entries:
+                self._entries[employee_id] = PresenceEntry(attendance_id, employee_id, employee_name, scanned_at)
+
+    def discard(self, attendance_id):
+        with self._lock:
+            for employee_id, entry in list(self._entries.items()):
+                if entry.attendance_id == attendance_id:
+                    del self._entries[employee_id]
+
+    def invalidate(self):
+        with self._lock:
+            self._day = None
+
+    def stats(self):
+        return {
+            "day": self._day.strftime("%Y-%m-%d") if self._day else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "present": len(self._entries)
+        }
+
+
+presence = PresenceSet()
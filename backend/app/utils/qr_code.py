@@ -0,0 +1,133 @@
+import base64
+import hashlib
+import hmac
+import threading
+import time
+
+from flask import current_app
+
+QR_PREFIX = "ATTENDANCE"
+
+
+class QRCodeInvalid(Exception):
+    """QR code tidak valid: format salah, tanda tangan salah, atau sudah kadaluarsa."""
+
+
+class QRCodeReplayed(QRCodeInvalid):
+    """QR code yang sama sudah dipakai employee ini di jendela yang sama."""
+
+
+def _secret():
+    key = current_app.config["QR_SECRET_KEY"]
+    if not key:
+        raise RuntimeError("QR_SECRET_KEY belum dikonfigurasi")
+    return key.encode() if isinstance(key, str) else key
+
+
+def _signature(site, window):
+    message = f"{QR_PREFIX}:{site}:{window}".encode()
+    digest = hmac.new(_secret(), message, hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _window(timestamp):
+    return int(timestamp // current_app.config["QR_ROTATION_SECONDS"])
+
+
+def current_qr_code(site="main", now=None):
+    """
+    QR code yang berlaku saat ini untuk layar di lokasi `site`.
+    Format: ATTENDANCE:<site>:<window>:<signature>
+    Return dict berisi qr_data dan sisa detik sebelum berganti.
+    """
+    if ":" in site:
+        raise ValueError("site tidak boleh mengandung ':'")
+    timestamp = time.time() if now is None else now
+    rotation = current_app.config["QR_ROTATION_SECONDS"]
+    window = _window(timestamp)
+    return {
+        "qr_data": f"{QR_PREFIX}:{site}:{window}:{_signature(site, window)}",
+        "site": site,
+        "rotation_seconds": rotation,
+        "expires_in": round((window + 1) * rotation - timestamp, 3)
+    }
+
+
+class ReplayCache:
+    """
+    Set (employee_id, site, window) yang sudah dipakai, dibuang otomatis setelah
+    TTL (masa berlaku QR). Per worker; absensi ganda di worker lain tetap ditolak
+    oleh unique constraint (employee_id, attendance_day) di database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = {}
+        self._next_sweep = 0.0
+        self.replays = 0
+
+    def claim(self, key, ttl):
+        """Tandai key sebagai terpakai; False jika key masih tercatat."""
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._seen = {k: exp for k, exp in self._seen.items() if exp > now}
+                self._next_sweep = now + ttl
+            expires_at = self._seen.get(key)
+            if expires_at is not None and expires_at > now:
+                self.replays += 1
+                return False
+            self._seen[key] = now + ttl
+            return True
+
+    def release(self, key):
+        """Lepas key yang sudah diklaim (scan gagal dicatat) supaya bisa dicoba ulang."""
+        with self._lock:
+            self._seen.pop(key, None)
+
+    def stats(self):
+        return {"entries": len(self._seen), "replays": self.replays}
+
+
+replay_cache = ReplayCache()
+
+
+def verify_qr_code(qr_data, employee_id, scanned_at=None):
+    """
+    Verifikasi QR code tanpa akses database: cek format, jendela waktu
+    (jendela sekarang + QR_GRACE_WINDOWS sebelumnya) dan HMAC secara
+    constant-time, lalu tolak pemakaian ulang oleh employee yang sama.
+    `scanned_at` (epoch detik) dipakai untuk replay scan offline.
+    Return key replay; pemanggil wajib melepasnya dengan release_qr_code()
+    jika absensi akhirnya tidak tercatat (404, tanpa jadwal, error database),
+    supaya percobaan ulang di jendela yang sama tidak ditolak sebagai replay.
+    """
+    parts = str(qr_data).split(":")
+    if len(parts) != 4 or parts[0] != QR_PREFIX:
+        raise QRCodeInvalid("Format QR Code tidak valid")
+    _, site, window, signature = parts
+    try:
+        window = int(window)
+    except ValueError:
+        raise QRCodeInvalid("Format QR Code tidak valid")
+
+    timestamp = time.time() if scanned_at is None else scanned_at
+    current = _window(timestamp)
+    grace = current_app.config["QR_GRACE_WINDOWS"]
+    if not current - grace <= window <= current:
+        raise QRCodeInvalid("QR Code sudah kadaluarsa")
+
+    if not hmac.compare_digest(signature.encode(), _signature(site, window).encode()):
+        raise QRCodeInvalid("QR Code tidak valid")
+
+    ttl = (grace + 1) * current_app.config["QR_ROTATION_SECONDS"]
+    key = (employee_id, site, window)
+    if not replay_cache.claim(key, ttl):
+        raise QRCodeReplayed("QR Code sudah dipakai")
+    return key
+
+
+def release_qr_code(key):
+    """Lepas klaim replay dari verify_qr_code() untuk scan yang gagal dicatat."""
+    if key is not None:
+        replay_cache.release(key)
@@ -0,0 +1,174 @@
+import hashlib
+import threading
+import time
+
+from flask import current_app, request
+from sqlalchemy import select
+
+from ..models import db, WorkSchedule, DailySchedule
+from .conditional import last_updated, row_count
+from .serializers import daily_schedule_row, work_schedule_row
+
+
+class ReferenceCache:
+    """
+    Cache in-process untuk data referensi kecil (work_schedules, daily_schedules)
+    dalam bentuk payload JSON yang sudah diserialisasi.
+
+    bump() dipanggil endpoint create/update/delete di worker ini, sehingga
+    pembacaan berikutnya langsung memuat ulang. Perubahan dari worker lain
+    terdeteksi lewat satu SELECT ringan (max(updated_at) + jumlah baris kedua
+    tabel) yang dijalankan paling sering sekali per REFERENCE_CACHE_CHECK_SECONDS;
+    di antaranya payload dilayani dari memori tanpa query. Versi data (hash isi
+    payload) dipakai sebagai ETag, sehingga sama di semua worker untuk data yang
+    sama. REFERENCE_CACHE_TTL menjadi jaring pengaman untuk perubahan dalam
+    detik yang sama dengan pemuatan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._loaded_counter = None
+        self._loaded_at = None
+        self._checked_at = None
+        self._db_state = None
+        self._payloads = {}
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.checks = 0
+
+    def bump(self):
+        with self._lock:
+            self._counter += 1
+
+    @staticmethod
+    def _current_db_state():
+        """max(updated_at) + jumlah baris work_schedules dan daily_schedules (satu query)."""
+        return tuple(db.session.execute(select(
+            last_updated(WorkSchedule),
+            row_count(WorkSchedule),
+            last_updated(DailySchedule),
+            row_count(DailySchedule)
+        )).one())
+
+    def _expired(self, db_state):
+        ttl = current_app.config.get("REFERENCE_CACHE_TTL", 60)
+        return (
+            self._loaded_counter != self._counter
+            or self._db_state != db_state
+            or (ttl and time.monotonic() - self._loaded_at > ttl)
+        )
+
+    def load(self, db_state=None):
+        """Muat ulang work_schedules + daily_schedules dan susun semua payload."""
+        counter = self._counter
+        db_state = db_state or self._current_db_state()
+        work_schedules = (
+            db.session.query(
+                WorkSchedule.id,
+                WorkSchedule.name,
+                WorkSchedule.start_time,
+                WorkSchedule.end_time,
+                WorkSchedule.tolerance_minutes
+            )
+            .order_by(WorkSchedule.id.asc())
+            .all()
+        )
+        daily_schedules = (
+            db.session.query(DailySchedule.id, DailySchedule.name)
+            .order_by(DailySchedule.id.asc())
+            .all()
+        )
+
+        dumps = current_app.json.dumps
+        work_schedule_list = [work_schedule_row(ws) for ws in work_schedules]
+        payloads = {
+            "work_schedules": dumps({
+                "total_schedules": len(work_schedule_list),
+                "work_schedules": work_schedule_list
+            }),
+            "available_schedules": dumps({
+                "daily_schedules": [daily_schedule_row(ds) for ds in daily_schedules],
+                "work_schedules": work_schedule_list
+            })
+        }
+        for ws in work_schedule_list:
+            payloads[("work_schedule", ws["id"])] = dumps(ws)
+        payloads = {key: value.encode() for key, value in payloads.items()}
+
+        digest = hashlib.sha1()
+        for key in sorted(payloads, key=str):
+            digest.update(str(key).encode() + b"\0" + payloads[key] + b"\0")
+
+        with self._lock:
+            self._payloads = payloads
+            self.version = digest.hexdigest()[:16]
+            self._loaded_counter = counter
+            self._loaded_at = time.monotonic()
+            self._checked_at = self._loaded_at
+            self._db_state = db_state
+
+    def _check_due(self):
+        interval = current_app.config.get("REFERENCE_CACHE_CHECK_SECONDS", 5)
+        return (
+            self._loaded_counter != self._counter
+            or self._checked_at is None
+            or time.monotonic() - self._checked_at >= interval
+        )
+
+    def get(self, key):
+        """
+        Return (version, payload bytes); payload None jika key tidak ada
+        (mis. id work schedule tidak ditemukan). Saat pengecekan database
+        berjalan, key yang tidak ada memicu satu kali muat ulang sebelum
+        dianggap tidak ditemukan.
+        """
+        checked = reloaded = False
+        if self._check_due():
+            checked = True
+            self.checks += 1
+            db_state = self._current_db_state()
+            self._checked_at = time.monotonic()
+            reloaded = self._expired(db_state)
+        if reloaded:
+            self.misses += 1
+            self.load(db_state)
+        else:
+            self.hits += 1
+        with self._lock:
+            version, payload = self.version, self._payloads.get(key)
+        if payload is None and checked and not reloaded:
+            self.misses += 1
+            self.load(db_state)
+            with self._lock:
+                version, payload = self.version, self._payloads.get(key)
+        return version, payload
+
+    def response(self, key):
+        """
+        Response JSON dari payload cache dengan ETag = versi data; 304 jika
+        If-None-Match cocok. None jika key tidak ada.
+        """
+        version, payload = self.get(key)
+        if payload is None:
+            return None
+        if request.if_none_match.contains(version):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(payload, mimetype=current_app.json.mimetype)
+        response.set_etag(version)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "checks": self.checks,
+            "version": self.version,
+            "entries": len(self._payloads)
+        }
+
+
+reference_cache = ReferenceCache()
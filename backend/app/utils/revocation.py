@@ -0,0 +1,105 @@
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from ..models import db, RevokedToken
+
+
+def employee_key(employee_id):
+    return f"employee:{employee_id}"
+
+
+class RevocationList:
+    """
+    Daftar jti token yang dicabut, disimpan in-memory sebagai dict jti -> exp
+    sehingga pengecekan di setiap @jwt_required cukup O(1) tanpa query MySQL.
+    Isi tabel revoked_tokens yang belum kadaluarsa (termasuk dari worker lain)
+    dimuat ulang paling sering sekali per REVOCATION_SYNC_SECONDS, sehingga jti
+    yang tokennya sudah kadaluarsa otomatis terbuang dari memori.
+
+    Penghapusan employee dicatat di tabel yang sama dengan kunci
+    "employee:<id>" (lihat revoke_employee), sehingga semua token milik
+    employee tersebut ikut ditolak tanpa perlu membaca tabel employee.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = {}
+        self._synced_at = None
+        self.checks = 0
+        self.syncs = 0
+
+    def _sync(self):
+        rows = (
+            db.session.query(RevokedToken.jti, RevokedToken.expires_at)
+            .filter(RevokedToken.expires_at > datetime.now())
+            .all()
+        )
+        with self._lock:
+            self._revoked = {r.jti: r.expires_at.timestamp() for r in rows}
+            self._synced_at = time.monotonic()
+            self.syncs += 1
+
+    def is_revoked(self, jwt_payload):
+        interval = current_app.config["REVOCATION_SYNC_SECONDS"]
+        if self._synced_at is None or time.monotonic() - self._synced_at > interval:
+            self._sync()
+        self.checks += 1
+        if jwt_payload.get("jti") in self._revoked:
+            return True
+        identity = jwt_payload.get("sub")
+        return (
+            isinstance(identity, dict)
+            and identity.get("role") == "employee"
+            and employee_key(identity.get("id")) in self._revoked
+        )
+
+    def revoke(self, jwt_payload):
+        """Cabut token (access/refresh) berdasarkan payload JWT-nya."""
+        expires_at = datetime.fromtimestamp(jwt_payload["exp"])
+        try:
+            db.session.add(RevokedToken(
+                jti=jwt_payload["jti"],
+                token_type=jwt_payload.get("type", "access"),
+                expires_at=expires_at
+            ))
+            db.session.commit()
+        except IntegrityError:
+            # Sudah pernah dicabut
+            db.session.rollback()
+        with self._lock:
+            self._revoked[jwt_payload["jti"]] = jwt_payload["exp"]
+
+    def revoke_employee(self, employee_id):
+        """
+        Cabut semua token milik employee (dipanggil saat employee dihapus).
+        Baris berlaku selama umur refresh token, karena setelah itu tidak ada
+        token lama yang masih valid dan login/refresh sudah menolak employee
+        yang dihapus. Tidak melakukan commit; ikut transaksi pemanggil.
+        """
+        key = employee_key(employee_id)
+        expires_at = datetime.now() + current_app.config["REFRESH_TOKEN_EXPIRES"]
+        existing = db.session.query(RevokedToken).filter(RevokedToken.jti == key).first()
+        if existing:
+            existing.expires_at = expires_at
+        else:
+            db.session.add(RevokedToken(jti=key, token_type="employee", expires_at=expires_at))
+        return key, expires_at
+
+    def remember(self, key, expires_at):
+        """Tambahkan kunci ke daftar lokal setelah transaksi berhasil di-commit."""
+        with self._lock:
+            self._revoked[key] = expires_at.timestamp()
+
+    def stats(self):
+        return {
+            "revoked": len(self._revoked),
+            "checks": self.checks,
+            "syncs": self.syncs
+        }
+
+
+revocation_list = RevocationList()
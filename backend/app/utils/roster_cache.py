@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from ..models import db, Employee, EmployeeSchedule, WorkSchedule, DailySchedule
+from .date_helper import HARI
+
+
+RosterEntry = namedtuple(
+    "RosterEntry",
+    ["work_schedule_id", "shift_name", "day_name", "start_time", "end_time", "tolerance_minutes"]
+)
+
+
+def punctuality_status(schedule, scanned_at):
+    """
+    "tepat_waktu" jika scan tidak lewat dari start_time + tolerance, selain itu "terlambat"
+    """
+    max_time = (
+        datetime.combine(scanned_at.date(), schedule.start_time)
+        + timedelta(minutes=schedule.tolerance_minutes or 0)
+    )
+    return "terlambat" if scanned_at > max_time else "tepat_waktu"
+
+
+def minutes_late(schedule, scanned_at):
+    """
+    Menit keterlambatan dihitung dari jam mulai shift, 0 jika masih dalam toleransi
+    """
+    if punctuality_status(schedule, scanned_at) != "terlambat":
+        return 0
+    start = datetime.combine(scanned_at.date(), schedule.start_time)
+    return int((scanned_at - start).total_seconds() // 60)
+
+
+class RosterCache:
+    """
+    Cache in-process untuk jadwal kerja karyawan per hari.
+    Key: (employee_id, weekday) dengan weekday 0 = Senin ... 6 = Minggu.
+    Seluruh roster dimuat sekali pada pemakaian pertama di setiap worker, lalu
+    entri karyawan yang jadwalnya diubah admin dimuat ulang secara terpisah.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._stale_employees = set()
+        self._loaded_at = None
+        self.hits = 0
+        self.misses = 0
+
+    def _query(self):
+        return (
+            db.session.query(
+                EmployeeSchedule.employee_id,
+                DailySchedule.name.label("day_name"),
+                WorkSchedule.id.label("work_schedule_id"),
+                WorkSchedule.name.label("shift_name"),
+                WorkSchedule.start_time,
+                WorkSchedule.end_time,
+                WorkSchedule.tolerance_minutes
+            )
+            .join(WorkSchedule, EmployeeSchedule.work_schedules_id == WorkSchedule.id)
+            .join(DailySchedule, DailySchedule.id == EmployeeSchedule.daily_schedules_id)
+            .join(Employee, Employee.id == EmployeeSchedule.employee_id)
+            .filter(Employee.not_deleted())
+            .order_by(EmployeeSchedule.id.asc())
+        )
+
+    def _store(self, rows):
+        for r in rows:
+            if r.day_name not in HARI:
+                continue
+            key = (r.employee_id, HARI.index(r.day_name))
+            # Sama seperti .first() sebelumnya: entri pertama yang menang
+            if key not in self._entries:
+                self._entries[key] = RosterEntry(
+                    r.work_schedule_id,
+                    r.shift_name,
+                    r.day_name,
+                    r.start_time,
+                    r.end_time,
+                    r.tolerance_minutes or 0
+                )
+
+    def _expired(self):
+        ttl = current_app.config.get("ROSTER_CACHE_TTL", 300)
+        return self._loaded_at is None or (ttl and time.monotonic() - self._loaded_at > ttl)
+
+    def load(self):
+        """Muat ulang seluruh roster dari database (satu query)."""
+        rows = self._query().all()
+        with self._lock:
+            self._entries = {}
+            self._stale_employees = set()
+            self._store(rows)
+            self._loaded_at = time.monotonic()
+
+    def get(self, employee_id, weekday):
+        """
+        Ambil shift karyawan untuk hari tertentu, None jika tidak ada jadwal.
+        """
+        if self._expired():
+            self.misses += 1
+            self.load()
+        elif employee_id in self._stale_employees:
+            self.misses += 1
+            rows = self._query().filter(EmployeeSchedule.employee_id == employee_id).all()
+            with self._lock:
+                self._store(rows)
+                self._stale_employees.discard(employee_id)
+        else:
+            self.hits += 1
+
+        return self._entries.get((employee_id, weekday))
+
+    def snapshot(self):
+        """
+        Salinan seluruh roster {(employee_id, weekday): RosterEntry} yang sudah segar,
+        untuk proses bulk yang tidak boleh menjalankan query di tengah streaming.
+        """
+        if self._expired() or self._stale_employees:
+            self.misses += 1
+            self.load()
+        with self._lock:
+            return dict(self._entries)
+
+    def invalidate_employee(self, employee_id):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == employee_id]:
+                del self._entries[key]
+            self._stale_employees.add(employee_id)
+
+    def invalidate_employees(self, employee_ids):
+        """Seperti invalidate_employee untuk banyak karyawan dengan satu kali lewat."""
+        employee_ids = set(employee_ids)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in employee_ids]:
+                del self._entries[key]
+            self._stale_employees.update(employee_ids)
+
+    def invalidate_work_schedule(self, work_schedule_id):
+        with self._lock:
+            affected = {k[0] for k, v in self._entries.items() if v.work_schedule_id == work_schedule_id}
+        for employee_id in affected:
+            self.invalidate_employee(employee_id)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "stale_employees": len(self._stale_employees)
+        }
+
+
+roster_cache = RosterCache()
@@ -0,0 +1,124 @@
+def iso_datetime(value):
+    """datetime -> "YYYY-MM-DD HH:MM:SS"."""
+    return value.isoformat(" ", "seconds") if value is not None else None
+
+
+def iso_date(value):
+    """date/datetime -> "YYYY-MM-DD"."""
+    return value.isoformat()[:10] if value is not None else None
+
+
+def iso_clock(value):
+    """datetime -> "HH:MM:SS"."""
+    return value.time().isoformat("seconds") if value is not None else None
+
+
+def iso_minutes(value):
+    """time -> "HH:MM"."""
+    return value.isoformat("minutes") if value is not None else None
+
+
+def serialize_rows(serializer, rows):
+    """Terapkan serializer ke seluruh baris."""
+    return [serializer(r) for r in rows]
+
+
+# Serializer baris query -> dict JSON, satu fungsi per bentuk response: dict
+# literal tanpa loop per field. Timestamp diformat dengan isoformat() (format
+# output sama dengan strftime lama).
+
+def employee_row(r):
+    return {
+        "id": r.id,
+        "nik": r.nik,
+        "name": r.name,
+        "gender": r.gender,
+        "position": r.position,
+        "email": r.email
+    }
+
+
+def attendance_row(r):
+    return {
+        "attendance_id": r.attendance_id,
+        "employee_id": r.employee_id,
+        "employee_name": r.employee_name,
+        "position": r.position,
+        "attendance_date": iso_datetime(r.attendance_date)
+    }
+
+
+def presence_row(r):
+    return {
+        "attendance_id": r.attendance_id,
+        "employee_id": r.employee_id,
+        "employee_name": r.employee_name,
+        "date": iso_date(r.scanned_at),
+        "time": iso_clock(r.scanned_at)
+    }
+
+
+def work_schedule_row(r):
+    return {
+        "id": r.id,
+        "name": r.name,
+        "start_time": iso_minutes(r.start_time),
+        "end_time": iso_minutes(r.end_time),
+        "tolerance_minutes": r.tolerance_minutes
+    }
+
+
+def work_schedule_op_row(r):
+    return {
+        "id": r.id,
+        "name": r.name,
+        "start_time": iso_minutes(r.start_time),
+        "end_time": iso_minutes(r.end_time),
+        "tolerance_minutes": r.tolerance_minutes,
+        "created_at": iso_datetime(r.created_at),
+        "employee_count": r.employee_count,
+        "distinct_employee_count": r.distinct_employee_count
+    }
+
+
+def daily_schedule_row(r):
+    return {
+        "id": r.id,
+        "name": r.name
+    }
+
+
+def employee_schedule_row(r):
+    return {
+        "employee_schedule_id": r.employee_schedule_id,
+        "day_id": r.day_id,
+        "day_name": r.day_name,
+        "schedule_id": r.schedule_id,
+        "schedule_name": r.schedule_name,
+        "start_time": iso_minutes(r.start_time),
+        "end_time": iso_minutes(r.end_time),
+        "tolerance_minutes": r.tolerance_minutes
+    }
+
+
+def employee_shift_row(r):
+    return {
+        "schedule_id": r.id,
+        "day_name": r.day_name,
+        "shift_name": r.shift_name,
+        "start_time": iso_minutes(r.start_time),
+        "end_time": iso_minutes(r.end_time),
+        "tolerance_minutes": r.tolerance_minutes
+    }
+
+
+def monthly_summary_row(r):
+    return {
+        "employee_id": r.employee_id,
+        "employee_name": r.employee_name,
+        "position": r.position,
+        "days_present": r.days_present,
+        "days_late": r.days_late,
+        "first_scan": iso_datetime(r.first_scan),
+        "last_scan": iso_datetime(r.last_scan)
+    }
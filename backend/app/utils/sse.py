@@ -0,0 +1,32 @@
+import json
+import threading
+
+
+class ChangeNotifier:
+    """
+    Penanda perubahan in-process: penulis memanggil notify() setelah commit,
+    stream SSE menunggu di wait() sampai ada perubahan atau timeout heartbeat.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.version = 0
+
+    def notify(self):
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, last_version, timeout):
+        with self._condition:
+            if self.version == last_version:
+                self._condition.wait(timeout)
+            return self.version
+
+
+def sse_event(event, data):
+    """Format satu event Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+attendance_changes = ChangeNotifier()
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,10 +10,86 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
     
+    # Masa berlaku token hasil login employee/admin: access token berumur pendek,
+    # diperpanjang lewat /api/auth/refresh memakai refresh token
+    ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv('ACCESS_TOKEN_EXPIRES_MINUTES', 15)))
+    REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.getenv('REFRESH_TOKEN_EXPIRES_DAYS', 7)))
+
+    # Identity JWT berupa dict {"id", "role"}; PyJWT >= 2.10 menolak `sub` non-string
+    # (422 "Subject must be a string") kecuali verifikasi sub dimatikan
+    JWT_VERIFY_SUB = False
+
+    # Token yang dicabut: interval (detik) sinkronisasi daftar in-memory dari tabel revoked_tokens
+    REVOCATION_SYNC_SECONDS = int(os.getenv('REVOCATION_SYNC_SECONDS', 10))
+
+    # QR absensi bertanda tangan HMAC: kunci, lama rotasi (detik), dan jumlah
+    # jendela sebelumnya yang masih diterima (toleransi jeda layar/jaringan)
+    QR_SECRET_KEY = os.getenv('QR_SECRET_KEY') or os.getenv('SECRET_KEY')
+    QR_ROTATION_SECONDS = int(os.getenv('QR_ROTATION_SECONDS', 30))
+    QR_GRACE_WINDOWS = int(os.getenv('QR_GRACE_WINDOWS', 1))
+
     # Database configuration
     SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Kebijakan hash password; hash lama otomatis di-hash ulang saat login berhasil.
+    # Gunakan `flask bench-hash` untuk memilih jumlah iterasi sesuai hardware.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 1000000))
+
+    # Verifikasi password: jumlah thread PBKDF2, panjang antrian, dan Retry-After (detik) saat penuh
+    PASSWORD_VERIFY_WORKERS = int(os.getenv('PASSWORD_VERIFY_WORKERS', 2))
+    PASSWORD_VERIFY_QUEUE = int(os.getenv('PASSWORD_VERIFY_QUEUE', 32))
+    PASSWORD_VERIFY_RETRY_AFTER = int(os.getenv('PASSWORD_VERIFY_RETRY_AFTER', 2))
+
+    # Import karyawan massal: baris per INSERT/transaksi, batas baris per request HTTP
+    # (hash lewat executor verifikasi password yang terbatas, durasi request kira-kira
+    # EMPLOYEE_IMPORT_MAX x waktu satu hash / PASSWORD_VERIFY_WORKERS, mis. 50 x 0,55s / 2
+    # = ~14s; import besar pakai `flask import-employees`), dan jumlah proses hash
+    # password CLI (0 = jumlah core CPU)
+    EMPLOYEE_IMPORT_CHUNK_SIZE = int(os.getenv('EMPLOYEE_IMPORT_CHUNK_SIZE', 1000))
+    EMPLOYEE_IMPORT_MAX = int(os.getenv('EMPLOYEE_IMPORT_MAX', 50))
+    EMPLOYEE_IMPORT_WORKERS = int(os.getenv('EMPLOYEE_IMPORT_WORKERS', 0))
+
+    # Batas jumlah baris employee_schedules per request bulk assign / salin jadwal
+    SCHEDULE_BULK_MAX = int(os.getenv('SCHEDULE_BULK_MAX', 10000))
+
+    # Purge karyawan soft-delete: umur minimal (hari) sebelum dihapus permanen
+    # dan jumlah karyawan per batch/transaksi DELETE
+    EMPLOYEE_PURGE_AFTER_DAYS = int(os.getenv('EMPLOYEE_PURGE_AFTER_DAYS', 30))
+    EMPLOYEE_PURGE_BATCH_SIZE = int(os.getenv('EMPLOYEE_PURGE_BATCH_SIZE', 100))
+
+    # Roster cache: detik sebelum seluruh roster dimuat ulang dari database
+    # (jaring pengaman untuk worker lain yang tidak menerima invalidasi)
+    ROSTER_CACHE_TTL = int(os.getenv('ROSTER_CACHE_TTL', 300))
+
+    # Reference cache work/daily schedule: detik sebelum dimuat ulang dari database
+    # (jaring pengaman), dan jeda minimal antar pengecekan max(updated_at) + count
+    # untuk perubahan dari worker lain (perubahan di worker sendiri langsung lewat bump())
+    REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', 60))
+    REFERENCE_CACHE_CHECK_SECONDS = int(os.getenv('REFERENCE_CACHE_CHECK_SECONDS', 5))
+
+    # Presence set "sudah absen hari ini": detik sebelum dimuat ulang dari database
+    PRESENCE_CACHE_TTL = int(os.getenv('PRESENCE_CACHE_TTL', 60))
+
+    # Dashboard admin hari ini: detik payload dipakai bersama sebelum dihitung ulang
+    DASHBOARD_CACHE_SECONDS = int(os.getenv('DASHBOARD_CACHE_SECONDS', 5))
+
+    # Live feed SSE: interval heartbeat / sinkronisasi ulang (detik)
+    SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+
+    # Identity cache /api/auth/verify: TTL (detik) dan jumlah entri maksimal (LRU).
+    # TTL juga batas waktu perubahan/penghapusan karyawan dari worker lain terlihat
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 60))
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', 1024))
+
+    # Export absensi: jumlah baris per chunk server-side cursor
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 5000))
+
+    # Batch scan: jumlah record maksimal per request dan umur maksimal scan offline (jam)
+    SCAN_BATCH_MAX = int(os.getenv('SCAN_BATCH_MAX', 1000))
+    SCAN_MAX_OFFLINE_HOURS = int(os.getenv('SCAN_MAX_OFFLINE_HOURS', 24))
+
     # Uploads configuration
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "static", "uploads", "products")
 
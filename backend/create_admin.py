@@ -1,7 +1,7 @@
 import os
-from werkzeug.security import generate_password_hash
 from app import create_app, db
 from app.models import Admin
+from app.utils.password import hash_password
 
 def create_admin(password, email, name="Administrator"):
     # Membuat aplikasi Flask
@@ -15,7 +15,7 @@ def create_admin(password, email, name="Administrator"):
             return
 
         # Buat admin baru
-        hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
+        hashed_password = hash_password(password)
         admin = Admin(
             name=name,
             email=email,
@@ -3,6 +3,8 @@
 import React, { useEffect, useState } from "react";
 import { Table, TableHeader, TableColumn, TableBody, TableRow, TableCell } from "@heroui/table";
 import { Spinner } from "@heroui/spinner";
+import { Input } from "@heroui/input";
+import { Button } from "@heroui/button";
 import { Attendance } from "@/types/api/attendance";
 import { attendanceService } from "@/services/attendance.service";
 
@@ -16,23 +18,37 @@ const columns = [
 const TableAttendanceData: React.FC = () => {
     const [attendances, setAttendances] = useState<Attendance[]>([]);
     const [loading, setLoading] = useState<boolean>(true);
+    const [loadingMore, setLoadingMore] = useState<boolean>(false);
     const [error, setError] = useState<string | null>(null);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [dateFrom, setDateFrom] = useState("");
+    const [dateTo, setDateTo] = useState("");
 
     useEffect(() => {
         fetchAttendances();
-    }, []);
+    }, [dateFrom, dateTo]);
 
-    const fetchAttendances = async () => {
+    const fetchAttendances = async (cursor?: string) => {
         try {
-            setLoading(true);
+            if (cursor) {
+                setLoadingMore(true);
+            } else {
+                setLoading(true);
+            }
             setError(null);
-            const response = await attendanceService.getAll();
-            setAttendances(response.attendances);
+            const response = await attendanceService.getAll({
+                date_from: dateFrom || undefined,
+                date_to: dateTo || undefined,
+                cursor,
+            });
+            setAttendances(prev => cursor ? [...prev, ...response.attendances] : response.attendances);
+            setNextCursor(response.next_cursor);
         } catch (err: any) {
             setError(err.message || 'Failed to fetch attendance records');
             console.error('Error fetching attendance:', err);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     };
 
@@ -77,73 +93,107 @@ const TableAttendanceData: React.FC = () => {
         }
     }, [attendances]);
 
+    const filters = (
+        <div className="mb-4 flex flex-wrap gap-3 items-end">
+            <Input
+                className="max-w-xs"
+                type="date"
+                label="From"
+                value={dateFrom}
+                onValueChange={setDateFrom}
+            />
+            <Input
+                className="max-w-xs"
+                type="date"
+                label="To"
+                value={dateTo}
+                onValueChange={setDateTo}
+            />
+        </div>
+    );
+
+    let content: React.ReactNode;
     if (loading) {
-        return (
+        content = (
             <div className="flex justify-center items-center min-h-[400px]">
                 <Spinner size="lg" label="Loading attendance records..." />
             </div>
         );
-    }
-
-    if (error) {
-        return (
+    } else if (error) {
+        content = (
             <div className="flex justify-center items-center min-h-[400px]">
                 <div className="text-center">
                     <p className="text-danger text-lg font-semibold mb-2">Error</p>
                     <p className="text-default-500">{error}</p>
                     <button
                         className="mt-4 px-4 py-2 bg-primary text-white rounded-lg"
-                        onClick={fetchAttendances}
+                        onClick={() => fetchAttendances()}
                     >
                         Retry
                     </button>
                 </div>
             </div>
         );
-    }
-
-    if (attendances.length === 0) {
-        return (
+    } else if (attendances.length === 0) {
+        content = (
             <div className="flex justify-center items-center min-h-[400px]">
                 <p className="text-default-500 text-lg">No attendance records found</p>
             </div>
         );
+    } else {
+        content = (
+            <>
+                <div className="mb-4 flex justify-between items-center">
+                    <p className="text-sm text-default-500">
+                        Showing Records: <span className="font-semibold">{attendances.length}</span>
+                    </p>
+                </div>
+                <Table aria-label="Attendance table with data from API">
+                    <TableHeader columns={columns}>
+                        {(column) => (
+                            <TableColumn
+                                key={column.uid}
+                                align="start"
+                            >
+                                {column.name}
+                            </TableColumn>
+                        )}
+                    </TableHeader>
+                    <TableBody items={attendances}>
+                        {(item) => (
+                            <TableRow key={item.attendance_id}>
+                                {(columnKey) => (
+                                    <TableCell>
+                                        {renderCell(
+                                            item,
+                                            columnKey as string,
+                                            attendances.findIndex(att => att.attendance_id === item.attendance_id)
+                                        )}
+                                    </TableCell>
+                                )}
+                            </TableRow>
+                        )}
+                    </TableBody>
+                </Table>
+                {nextCursor && (
+                    <div className="mt-4 flex justify-center">
+                        <Button
+                            variant="flat"
+                            isLoading={loadingMore}
+                            onPress={() => fetchAttendances(nextCursor)}
+                        >
+                            Load more
+                        </Button>
+                    </div>
+                )}
+            </>
+        );
     }
 
     return (
         <>
-            <div className="mb-4 flex justify-between items-center">
-                <p className="text-sm text-default-500">
-                    Total Records: <span className="font-semibold">{attendances.length}</span>
-                </p>
-            </div>
-            <Table aria-label="Attendance table with data from API">
-                <TableHeader columns={columns}>
-                    {(column) => (
-                        <TableColumn
-                            key={column.uid}
-                            align="start"
-                        >
-                            {column.name}
-                        </TableColumn>
-                    )}
-                </TableHeader>
-                <TableBody items={attendances}>
-                    {(item) => (
-                        <TableRow key={item.attendance_id}>
-                            {(columnKey) => (
-                                <TableCell>
-                                    {renderCell(
-                                        item,
-                                        columnKey as string,
-                                        attendances.findIndex(att => att.attendance_id === item.attendance_id)
-                                    )}
-                                </TableCell>
-                            )}
-                        </TableRow>
-                    )}
-                </TableBody>
-            </Table>
+            {filters}
+            {content}
         </>
     );
 };
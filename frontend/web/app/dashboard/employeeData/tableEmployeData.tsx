@@ -5,6 +5,9 @@ import { Table, TableHeader, TableColumn, TableBody, TableRow, TableCell } from
 import { Chip } from "@heroui/chip";
 import { Tooltip } from "@heroui/tooltip";
 import { Spinner } from "@heroui/spinner";
+import { Input } from "@heroui/input";
+import { Select, SelectItem } from "@heroui/select";
+import { Button } from "@heroui/button";
 import { Employee, EmployeeDetailResponse } from "@/types/api/employee";
 import { employeeService } from "@/services/employee.service";
 import ModalEmployee from "./modalEmploye";
@@ -19,6 +22,14 @@ const columns = [
     { name: "ACTIONS", uid: "actions" },
 ];
 
+const genderOptions = [
+    { key: "all", label: "All genders" },
+    { key: "Male", label: "Male" },
+    { key: "Female", label: "Female" },
+];
+
+const SEARCH_DEBOUNCE_MS = 300;
+
 const genderColorMap: Record<string, "primary" | "secondary"> = {
     Male: "primary",
     Female: "secondary",
@@ -97,28 +108,46 @@ const DeleteIcon = (props: any) => (
 const TableEmployeeData: React.FC = () => {
     const [employees, setEmployees] = useState<Employee[]>([]);
     const [loading, setLoading] = useState<boolean>(true);
+    const [loadingMore, setLoadingMore] = useState<boolean>(false);
     const [error, setError] = useState<string | null>(null);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [search, setSearch] = useState("");
+    const [position, setPosition] = useState("");
+    const [gender, setGender] = useState("");
     const [isEditModalOpen, setIsEditModalOpen] = useState(false);
     const [selectedEmployee, setSelectedEmployee] = useState<EmployeeDetailResponse | null>(null);
     const [loadingDetail, setLoadingDetail] = useState(false);
     const [isDeleteModalOpen, setIsDeleteModalOpen] = useState(false);
     const [employeeToDelete, setEmployeeToDelete] = useState<Employee | null>(null);
 
+    // Filters are applied on the server; typing is debounced
     useEffect(() => {
-        fetchEmployees();
-    }, []);
+        const timer = setTimeout(() => fetchEmployees(), SEARCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [search, position, gender]);
 
-    const fetchEmployees = async () => {
+    const fetchEmployees = async (cursor?: string) => {
         try {
-            setLoading(true);
+            if (cursor) {
+                setLoadingMore(true);
+            } else {
+                setLoading(true);
+            }
             setError(null);
-            const response = await employeeService.getAll();
-            setEmployees(response.employees);
+            const response = await employeeService.getAll({
+                q: search.trim() || undefined,
+                position: position.trim() || undefined,
+                gender: gender || undefined,
+                cursor,
+            });
+            setEmployees(prev => cursor ? [...prev, ...response.employees] : response.employees);
+            setNextCursor(response.next_cursor);
         } catch (err: any) {
             setError(err.message || 'Failed to fetch employees');
             console.error('Error fetching employees:', err);
         } finally {
             setLoading(false);
+            setLoadingMore(false);
         }
     };
 
@@ -221,68 +250,118 @@ const TableEmployeeData: React.FC = () => {
         }
     }, [employees]);
 
+    const filters = (
+        <div className="mb-4 flex flex-wrap gap-3 items-end">
+            <Input
+                className="max-w-xs"
+                label="Search"
+                placeholder="Name, NIK or email"
+                value={search}
+                onValueChange={setSearch}
+                isClearable
+                onClear={() => setSearch("")}
+            />
+            <Input
+                className="max-w-xs"
+                label="Position"
+                value={position}
+                onValueChange={setPosition}
+                isClearable
+                onClear={() => setPosition("")}
+            />
+            <Select
+                className="max-w-xs"
+                label="Gender"
+                selectedKeys={[gender || "all"]}
+                onSelectionChange={(keys) => {
+                    const value = Array.from(keys)[0] as string;
+                    setGender(!value || value === "all" ? "" : value);
+                }}
+            >
+                {genderOptions.map((option) => (
+                    <SelectItem key={option.key}>{option.label}</SelectItem>
+                ))}
+            </Select>
+        </div>
+    );
+
+    let content: React.ReactNode;
     if (loading) {
-        return (
+        content = (
             <div className="flex justify-center items-center min-h-[400px]">
                 <Spinner size="lg" label="Loading employees..." />
             </div>
         );
-    }
-
-    if (error) {
-        return (
+    } else if (error) {
+        content = (
             <div className="flex justify-center items-center min-h-[400px]">
                 <div className="text-center">
                     <p className="text-danger text-lg font-semibold mb-2">Error</p>
                     <p className="text-default-500">{error}</p>
                     <button
                         className="mt-4 px-4 py-2 bg-primary text-white rounded-lg"
-                        onClick={fetchEmployees}
+                        onClick={() => fetchEmployees()}
                     >
                         Retry
                     </button>
                 </div>
             </div>
         );
-    }
-
-    if (employees.length === 0) {
-        return (
+    } else if (employees.length === 0) {
+        content = (
             <div className="flex justify-center items-center min-h-[400px]">
                 <p className="text-default-500 text-lg">No employees found</p>
             </div>
         );
+    } else {
+        content = (
+            <>
+                <Table aria-label="Employee table with data from API">
+                    <TableHeader columns={columns}>
+                        {(column) => (
+                            <TableColumn
+                                key={column.uid}
+                                align={column.uid === "actions" ? "center" : "start"}
+                            >
+                                {column.name}
+                            </TableColumn>
+                        )}
+                    </TableHeader>
+                    <TableBody items={employees}>
+                        {(item) => (
+                            <TableRow key={item.id}>
+                                {(columnKey) => (
+                                    <TableCell>
+                                        {renderCell(
+                                            item,
+                                            columnKey as string,
+                                            employees.findIndex(emp => emp.id === item.id)
+                                        )}
+                                    </TableCell>
+                                )}
+                            </TableRow>
+                        )}
+                    </TableBody>
+                </Table>
+                {nextCursor && (
+                    <div className="mt-4 flex justify-center">
+                        <Button
+                            variant="flat"
+                            isLoading={loadingMore}
+                            onPress={() => fetchEmployees(nextCursor)}
+                        >
+                            Load more
+                        </Button>
+                    </div>
+                )}
+            </>
+        );
     }
 
     return (
         <>
-            <Table aria-label="Employee table with data from API">
-                <TableHeader columns={columns}>
-                    {(column) => (
-                        <TableColumn
-                            key={column.uid}
-                            align={column.uid === "actions" ? "center" : "start"}
-                        >
-                            {column.name}
-                        </TableColumn>
-                    )}
-                </TableHeader>
-                <TableBody items={employees}>
-                    {(item) => (
-                        <TableRow key={item.id}>
-                            {(columnKey) => (
-                                <TableCell>
-                                    {renderCell(
-                                        item,
-                                        columnKey as string,
-                                        employees.findIndex(emp => emp.id === item.id)
-                                    )}
-                                </TableCell>
-                            )}
-                        </TableRow>
-                    )}
-                </TableBody>
-            </Table>
+            {filters}
+            {content}
             <ModalEmployee
                 isOpen={isEditModalOpen}
                 onClose={handleModalClose}
@@ -1,11 +1,15 @@
-import { AttendancesResponse } from "@/types/api/attendance";
+import { AttendanceListParams, AttendancesResponse } from "@/types/api/attendance";
 import { BaseService } from "./base.service";
 
 class AttendanceService extends BaseService {
     private readonly endpoint = '/admin/attendance';
 
-    async getAll(): Promise<AttendancesResponse> {
-        return this.get<AttendancesResponse>(this.endpoint);
+    /**
+     * List attendance records (newest first, cursor-paginated on the server).
+     * Pass next_cursor from the previous response as `cursor` to get the next page.
+     */
+    async getAll(params?: AttendanceListParams): Promise<AttendancesResponse> {
+        return this.get<AttendancesResponse>(this.endpoint, { params });
     }
 }
 
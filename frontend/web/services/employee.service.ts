@@ -1,10 +1,14 @@
-import { Employee, EmployeesResponse, PaginationParams, EmployeeDetailResponse, AvailableSchedulesResponse } from "@/types/api/employee";
+import { EmployeesResponse, EmployeeListParams, EmployeeDetailResponse, AvailableSchedulesResponse } from "@/types/api/employee";
 import { BaseService } from "./base.service";
 
 class EmployeeService extends BaseService {
     private readonly endpoint = '/admin/employees';
 
-    async getAll(params?: PaginationParams): Promise<EmployeesResponse> {
+    /**
+     * List employees (filtered and cursor-paginated on the server).
+     * Pass next_cursor from the previous response as `cursor` to get the next page.
+     */
+    async getAll(params?: EmployeeListParams): Promise<EmployeesResponse> {
         return this.get<EmployeesResponse>(this.endpoint, { params });
     }
 
@@ -39,9 +43,7 @@ class EmployeeService extends BaseService {
     }
 
     async search(query: string): Promise<EmployeesResponse> {
-        return this.get<EmployeesResponse>(`${this.endpoint}/search`, {
-            params: { q: query }
-        });
+        return this.getAll({ q: query });
     }
 
     // ====== SCHEDULE MANAGEMENT METHODS ======
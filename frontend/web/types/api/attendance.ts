@@ -1,3 +1,5 @@
+import { PaginationParams } from "./employee";
+
 export interface ApiResponse<T = any> {
     data?: T;
     message?: string;
@@ -13,6 +15,15 @@ export interface Attendance {
 }
 
 export interface AttendancesResponse {
-    total_attendance: number;
+    count: number;
     attendances: Attendance[];
-}
\ No newline at end of file
+    limit: number;
+    next_cursor: string | null;
+}
+
+export interface AttendanceListParams extends PaginationParams {
+    date_from?: string;
+    date_to?: string;
+    employee_id?: number;
+    position?: string;
+}
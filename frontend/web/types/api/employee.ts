@@ -36,14 +36,20 @@ export interface EmployeeDetailResponse {
 
 export interface EmployeesResponse {
     employees: Employee[];
-    total_employees: number;
+    count: number;
+    limit: number;
+    next_cursor: string | null;
 }
 
 export interface PaginationParams {
-    page?: number;
     limit?: number;
-    sort?: string;
-    order?: 'asc' | 'desc';
+    cursor?: string;
+}
+
+export interface EmployeeListParams extends PaginationParams {
+    q?: string;
+    position?: string;
+    gender?: string;
 }
 
 export interface DailySchedule {